@@ -9,31 +9,22 @@ from pathlib import Path
 
 
 def parse_markdown(markdown_text: str) -> tuple[str, str]:
-    lines = markdown_text.splitlines()
-
-    title_idx = -1
-    for i, line in enumerate(lines):
-        if line.strip():
-            title_idx = i
-            break
-
-    if title_idx == -1:
+    text = markdown_text.lstrip()
+    if not text:
         raise ValueError("Input markdown is empty.")
 
-    title_line = lines[title_idx].strip()
-    if title_line.startswith("#"):
-        title = title_line.lstrip("#").strip()
-    else:
-        title = title_line
+    newline_idx = text.find("\n")
+    title_line = text if newline_idx == -1 else text[:newline_idx]
+    rest = "" if newline_idx == -1 else text[newline_idx + 1 :]
+
+    title = title_line.strip()
+    if title.startswith("#"):
+        title = title.lstrip("#").strip()
 
     if not title:
         raise ValueError("Release title is empty.")
 
-    description_lines = lines[title_idx + 1 :]
-    while description_lines and not description_lines[0].strip():
-        description_lines.pop(0)
-
-    description = "\n".join(description_lines).strip()
+    description = rest.strip()
     if not description:
         raise ValueError("Release description is empty. Add content after the title.")
 
@@ -70,7 +61,8 @@ def main() -> int:
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    # The file is committed, so always emit the same ASCII-escaped bytes.
+    output_path.write_bytes((json.dumps(payload, indent=2) + "\n").encode("ascii"))
 
     print(f"Wrote {output_path} from {input_path}")
     return 0
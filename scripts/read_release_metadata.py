@@ -6,32 +6,48 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import uuid
+import secrets
 from pathlib import Path
+from typing import Any
+
+_orjson: Any
+try:
+    import orjson as _orjson_module  # optional speedup
+    _orjson = _orjson_module
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
 
 
 def build_release_text(metadata_path: Path, tag: str) -> tuple[str, str]:
-    data = json.loads(metadata_path.read_text(encoding="utf-8"))
+    raw = metadata_path.read_bytes()
+    if _orjson is not None:
+        data = _orjson.loads(raw)
+    else:
+        data = json.loads(raw.decode("utf-8"))
+
+    return _substitute_tag(data["title"], tag), _substitute_tag(data["description"], tag)
+
 
-    title = data["title"].replace("{{tag}}", tag)
-    description = data["description"].replace("{{tag}}", tag)
-    return title, description
+def _substitute_tag(text: str, tag: str) -> str:
+    if "{{tag}}" not in text:
+        return text
+    return text.replace("{{tag}}", tag)
 
 
 def _make_delimiter(body: str) -> str:
-    delimiter = f"GITHUB_OUTPUT_{uuid.uuid4().hex}"
-    while delimiter in body:
-        delimiter = f"GITHUB_OUTPUT_{uuid.uuid4().hex}"
+    # 128 random bits cannot collide with release text by accident; the single
+    # containment check only guards against a body that embeds this exact value.
+    delimiter = f"GITHUB_OUTPUT_{secrets.token_hex(16)}"
+    if delimiter in body:
+        delimiter = f"GITHUB_OUTPUT_{secrets.token_hex(32)}"
     return delimiter
 
 
 def write_outputs(output_path: Path, title: str, body: str) -> None:
     delimiter = _make_delimiter(body)
+    payload = f"title={title}\nbody<<{delimiter}\n{body}\n{delimiter}\n"
     with output_path.open("a", encoding="utf-8") as out:
-        out.write(f"title={title}\n")
-        out.write(f"body<<{delimiter}\n")
-        out.write(body)
-        out.write(f"\n{delimiter}\n")
+        out.write(payload)
 
 
 def main() -> int:
@@ -8,6 +8,7 @@ import re
 from pathlib import Path
 
 VERSION_PATTERN = re.compile(r'^version\s*=\s*"([^"]+)"\s*$')
+SEMVER_PATTERN = re.compile(r"\d+\.\d+\.\d+")
 
 
 def set_project_version(pyproject_text: str, version: str) -> str:
@@ -15,16 +16,18 @@ def set_project_version(pyproject_text: str, version: str) -> str:
     changed = False
     output_lines: list[str] = []
 
-    for line in pyproject_text.splitlines(keepends=True):
+    lines = pyproject_text.splitlines(keepends=True)
+    for idx, line in enumerate(lines):
         stripped = line.strip()
         if stripped.startswith("[") and stripped.endswith("]"):
             in_project = stripped == "[project]"
 
-        if in_project and VERSION_PATTERN.match(stripped):
+        if in_project and stripped.startswith("version") and VERSION_PATTERN.match(stripped):
             newline = "\n" if line.endswith("\n") else ""
             output_lines.append(f'version = "{version}"{newline}')
+            output_lines.extend(lines[idx + 1 :])
             changed = True
-            continue
+            break
 
         output_lines.append(line)
 
@@ -44,12 +47,12 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    if not re.fullmatch(r"\d+\.\d+\.\d+", args.version):
+    if not SEMVER_PATTERN.fullmatch(args.version):
         raise ValueError("Version must match semantic format X.Y.Z")
 
     pyproject_path = Path(args.pyproject)
     updated = set_project_version(pyproject_path.read_text(encoding="utf-8"), args.version)
-    pyproject_path.write_text(updated, encoding="utf-8")
+    pyproject_path.write_bytes(updated.encode("utf-8"))
     print(f"Updated {pyproject_path} to version {args.version}")
     return 0
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,6 +20,13 @@ class BackendCapabilities:
     supports_timeout: bool
 
 
+_LOCAL_BACKENDS = frozenset({"local", "localengine"})
+_DOCKER_BACKENDS = frozenset({"docker", "dockerengine"})
+_FULL_CAPABILITIES = BackendCapabilities(True, True, True, True)
+_NO_CAPABILITIES = BackendCapabilities(False, False, False, False)
+
+
+@lru_cache(maxsize=8)
 def capabilities_for_backend(backend: str) -> BackendCapabilities:
     """Return capability flags for a backend name.
 
@@ -27,11 +35,9 @@ def capabilities_for_backend(backend: str) -> BackendCapabilities:
         caps = capabilities_for_backend("docker")
         ```
     """
-    if backend in {"local", "localengine"}:
-        return BackendCapabilities(True, True, True, True)
-    if backend in {"docker", "dockerengine"}:
-        return BackendCapabilities(True, True, True, True)
-    return BackendCapabilities(False, False, False, False)
+    if backend in _LOCAL_BACKENDS or backend in _DOCKER_BACKENDS:
+        return _FULL_CAPABILITIES
+    return _NO_CAPABILITIES
 
 
 def preflight_validate_backend_capabilities(backend: str) -> None:
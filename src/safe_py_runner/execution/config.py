@@ -107,9 +107,10 @@ def validate_pinned_packages(packages: list[str] | None) -> list[str]:
     """
     if not packages:
         return []
-    normalized = sorted({pkg.strip() for pkg in packages if pkg.strip()})
+    normalized = sorted({stripped for pkg in packages if (stripped := pkg.strip())})
+    match = _PINNED_PACKAGE_PATTERN.match
     for pkg in normalized:
-        if not _PINNED_PACKAGE_PATTERN.match(pkg):
+        if not match(pkg):
             raise ValueError(
                 "Package specs must be pinned as 'name==version'. "
                 f"Invalid package: {pkg}"
@@ -130,5 +131,13 @@ def env_hash(
         key = env_hash(python_version="3.11", packages=["pandas==2.2.2"], namespace="demo")
         ```
     """
-    material = f"{python_version}|{namespace or ''}|{'|'.join(packages)}"
-    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+    digest = hashlib.sha256()
+    digest.update(python_version.encode("utf-8"))
+    digest.update(b"|")
+    digest.update((namespace or "").encode("utf-8"))
+    digest.update(b"|")
+    for idx, pkg in enumerate(packages):
+        if idx:
+            digest.update(b"|")
+        digest.update(pkg.encode("utf-8"))
+    return digest.hexdigest()[:16]
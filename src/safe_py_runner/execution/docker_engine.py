@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 import os
 import shutil
+import stat
 import subprocess
 import tempfile
+import threading
 import time
 from pathlib import Path
 from typing import Mapping
@@ -23,10 +25,24 @@ from .config import (
     validate_pinned_packages,
 )
 from .docker_pool import GLOBAL_DOCKER_POOL
+from .serialization import json_dumps_bytes, json_loads
 from .types import ExecutionOutcome, ExecutionRequest
 
+SSH_CONTROL_PERSIST_SECONDS = 60
+DOCKER_PROBE_TTL_SECONDS = 30.0
+LOCAL_DOCKER_SOCKET = "/var/run/docker.sock"
+_WORKER_EXEC_SUFFIX = ("python", "-m", "safe_py_runner.worker")
 
-def docker_is_available(*, docker_env: Mapping[str, str], docker_context: str | None) -> tuple[bool, str | None]:
+# Images already confirmed present, keyed by (docker target, image ref), so warm
+# engines skip `docker image inspect` on every run. The target covers the SSH
+# user and port too, since hosts reached through different tunnels can differ.
+_KNOWN_IMAGES: set[tuple[tuple[str, str, str, str], str]] = set()
+_KNOWN_IMAGES_LOCK = threading.Lock()
+
+
+def docker_is_available(
+    *, docker_env: Mapping[str, str] | None, docker_context: str | None
+) -> tuple[bool, str | None]:
     """Check Docker CLI and daemon accessibility for the selected target.
 
     Example:
@@ -36,16 +52,95 @@ def docker_is_available(*, docker_env: Mapping[str, str], docker_context: str |
     """
     if shutil.which("docker") is None:
         return False, "Docker CLI was not found. Install Docker and ensure it is on PATH."
+    if docker_context is None and _local_socket_is_usable(docker_env):
+        return True, None
     cmd = ["docker"]
     if docker_context:
         cmd.extend(["--context", docker_context])
     cmd.append("info")
-    probe = subprocess.run(cmd, capture_output=True, text=True, check=False, env=dict(docker_env))
+    probe = subprocess.run(cmd, capture_output=True, text=True, check=False, env=docker_env)
     if probe.returncode != 0:
         return False, "Docker is installed but the daemon is not running or not accessible."
     return True, None
 
 
+def _local_socket_is_usable(docker_env: Mapping[str, str] | None) -> bool:
+    """Return True when Docker targets the default local socket and it is reachable.
+
+    The check only stats the socket and tests its permissions; it does not
+    talk to the daemon. It declines, so callers fall back to `docker info`,
+    whenever the CLI may target something else: a non-local `DOCKER_HOST`,
+    a `DOCKER_CONTEXT`, or a non-default `currentContext` in the Docker CLI
+    config file.
+
+    Example:
+        ```python
+        fast_path = _local_socket_is_usable(os.environ)
+        ```
+    """
+    env = os.environ if docker_env is None else docker_env
+    docker_host = env.get("DOCKER_HOST", "")
+    if docker_host not in ("", f"unix://{LOCAL_DOCKER_SOCKET}"):
+        return False
+    # An explicit DOCKER_HOST wins over any context, as it does for the CLI.
+    if not docker_host and _configured_context(env) not in ("", "default"):
+        return False
+    try:
+        mode = os.stat(LOCAL_DOCKER_SOCKET).st_mode
+    except OSError:
+        return False
+    return stat.S_ISSOCK(mode) and os.access(LOCAL_DOCKER_SOCKET, os.R_OK | os.W_OK)
+
+
+def _configured_context(env: Mapping[str, str]) -> str | None:
+    """Return the Docker context the CLI would use, `""` when none is set.
+
+    Reads `DOCKER_CONTEXT`, then `currentContext` from `config.json` under
+    `DOCKER_CONFIG` (default `~/.docker`). Returns `None` when the config file
+    exists but cannot be read, so callers treat the target as unknown.
+
+    Example:
+        ```python
+        context = _configured_context(os.environ)
+        ```
+    """
+    if env.get("DOCKER_CONTEXT"):
+        return env["DOCKER_CONTEXT"]
+    config_dir = env.get("DOCKER_CONFIG") or str(Path.home() / ".docker")
+    try:
+        config = json.loads((Path(config_dir) / "config.json").read_bytes())
+    except FileNotFoundError:
+        return ""
+    except (OSError, ValueError):
+        return None
+    context = config.get("currentContext", "") if isinstance(config, dict) else None
+    return context if isinstance(context, str) else None
+
+
+def _ssh_control_dir() -> Path:
+    """Return a private (0700) per-user directory for SSH control sockets.
+
+    Uses `~/.ssh/safe-py-runner` so other local users can neither hijack nor
+    pre-create the multiplexed connection socket. Falls back to a fresh
+    `mkdtemp` directory, which is also 0700, when the home directory is not
+    writable.
+
+    Example:
+        ```python
+        control_path = _ssh_control_dir() / "%C"
+        ```
+    """
+    control_dir = Path.home() / ".ssh" / "safe-py-runner"
+    try:
+        control_dir.parent.mkdir(mode=0o700, exist_ok=True)
+        control_dir.mkdir(mode=0o700, exist_ok=True)
+        # mkdir leaves an existing directory's mode alone, so tighten it.
+        control_dir.chmod(0o700)
+    except OSError:
+        return Path(tempfile.mkdtemp(prefix="safe-py-runner-ssh-"))
+    return control_dir
+
+
 def _repo_root() -> Path:
     """Return repository root path used for local Docker builds.
 
@@ -104,7 +199,24 @@ class DockerEngine:
         self._ssh_port = ssh_port
         self._ssh_key_path = ssh_key_path
         self._cached_image: str | None = None
+        self._env_key = env_hash(
+            python_version="3.11",
+            packages=self._packages,
+            namespace=self._name,
+        )
+        self._labels = {**MANAGED_LABELS_BASE, "safe_py_runner.env_hash": self._env_key}
         self._validate_connection_options()
+        self._env = self._docker_env()
+        self._target = (
+            self._docker_context or "",
+            (os.environ if self._env is None else self._env).get("DOCKER_HOST", ""),
+            self._ssh_user or "",
+            str(self._ssh_port or ""),
+        )
+        self._probe_lock = threading.Lock()
+        self._probe_ok_until = 0.0
+        context_args = ("--context", self._docker_context) if self._docker_context else ()
+        self._exec_prefix = ("docker", *context_args, "exec", "-i", "-w")
 
     def execute(self, request: ExecutionRequest) -> ExecutionOutcome:
         """Execute one request inside a pooled Docker container.
@@ -114,10 +226,7 @@ class DockerEngine:
             outcome = engine.execute(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
             ```
         """
-        available, reason = docker_is_available(
-            docker_env=self._docker_env(),
-            docker_context=self._docker_context,
-        )
+        available, reason = self._probe_docker()
         if not available:
             return ExecutionOutcome("", "", 125, False, reason)
 
@@ -125,8 +234,7 @@ class DockerEngine:
         memory_limit_mb = int(request.payload.get("policy", {}).get("memory_limit_mb", 256))
         timeout_seconds = int(request.timeout_seconds)
         settings = self._pool_settings(timeout_seconds)
-        env_key = self._environment_key()
-        labels = {**MANAGED_LABELS_BASE, "safe_py_runner.env_hash": env_key}
+        labels = self._labels
 
         lease = None
         mark_bad = False
@@ -136,16 +244,28 @@ class DockerEngine:
                 settings=settings,
                 memory_limit_mb=memory_limit_mb,
                 labels=labels,
-                docker_env=self._docker_env(),
+                docker_env=self._env,
+                docker_context=self._docker_context,
+            )
+            GLOBAL_DOCKER_POOL.ensure_warm(
+                image=image,
+                settings=settings,
+                memory_limit_mb=memory_limit_mb,
+                labels=labels,
+                docker_env=self._env,
                 docker_context=self._docker_context,
             )
+            workdir = f"/tmp/safe_py_runner/run_{int(time.time() * 1000)}"
             prep = self._run_docker(
                 [
                     "exec",
                     lease.container_name,
                     "sh",
                     "-lc",
-                    "rm -rf /tmp/* /tmp/.[!.]* /tmp/..?* 2>/dev/null || true; mkdir -p /tmp/safe_py_runner",
+                    (
+                        "rm -rf /tmp/* /tmp/.[!.]* /tmp/..?* 2>/dev/null || true; "
+                        f"mkdir -p {workdir}"
+                    ),
                 ]
             )
             if prep.returncode != 0:
@@ -157,44 +277,20 @@ class DockerEngine:
                     False,
                     "Failed to prepare docker workspace",
                 )
-            workdir = f"/tmp/safe_py_runner/run_{int(time.time() * 1000)}"
-            prep_dir = self._run_docker(["exec", lease.container_name, "mkdir", "-p", workdir])
-            if prep_dir.returncode != 0:
-                mark_bad = True
-                return ExecutionOutcome(
-                    "",
-                    prep_dir.stderr,
-                    prep_dir.returncode,
-                    False,
-                    "Failed to create docker run workspace",
-                )
 
-            cmd = [
-                "docker",
-            ]
-            if self._docker_context:
-                cmd.extend(["--context", self._docker_context])
-            cmd.extend(
-                [
-                "exec",
-                "-i",
-                "-w",
-                workdir,
-                lease.container_name,
-                "python",
-                "-m",
-                "safe_py_runner.worker",
-                ]
-            )
             try:
                 completed = subprocess.run(
-                    cmd,
-                    input=json.dumps(request.payload),
+                    [
+                        *self._exec_prefix,
+                        workdir,
+                        lease.container_name,
+                        *_WORKER_EXEC_SUFFIX,
+                    ],
+                    input=json_dumps_bytes(request.payload),
                     capture_output=True,
-                    text=True,
                     timeout=max(1, timeout_seconds),
                     check=False,
-                    env=self._docker_env(),
+                    env=self._env,
                 )
             except subprocess.TimeoutExpired:
                 mark_bad = True
@@ -205,9 +301,13 @@ class DockerEngine:
                     True,
                     f"Execution timed out after {timeout_seconds}s",
                 )
+            if completed.returncode != 0 and not completed.stdout.strip():
+                # The worker always answers with JSON; silence means the exec
+                # itself failed, so the container should not be reused.
+                mark_bad = True
             return ExecutionOutcome(
-                completed.stdout,
-                completed.stderr,
+                completed.stdout.decode("utf-8", "replace"),
+                completed.stderr.decode("utf-8", "replace"),
                 completed.returncode,
                 False,
             )
@@ -219,7 +319,7 @@ class DockerEngine:
                     image=image,
                     container_name=lease.container_name,
                     mark_bad=mark_bad,
-                    docker_env=self._docker_env(),
+                    docker_env=self._env,
                     docker_context=self._docker_context,
                 )
 
@@ -231,8 +331,13 @@ class DockerEngine:
             containers = engine.list_containers(all_states=True)
             ```
         """
-        fmt = "{{.ID}}|{{.Names}}|{{.Image}}|{{.State}}|{{.Status}}"
-        cmd = ["ps", "--filter", f"label=safe_py_runner.managed={MANAGED_LABEL_VALUE}", "--format", fmt]
+        cmd = [
+            "ps",
+            "--filter",
+            f"label=safe_py_runner.managed={MANAGED_LABEL_VALUE}",
+            "--format",
+            "{{json .}}",
+        ]
         if all_states:
             cmd.insert(1, "-a")
         out = self._run_docker(cmd)
@@ -242,8 +347,10 @@ class DockerEngine:
         for line in out.stdout.splitlines():
             if not line.strip():
                 continue
-            c_id, name, image, state, status = line.split("|", 4)
-            items.append(ContainerInfo(c_id, name, image, state, status))
+            row = json_loads(line)
+            items.append(
+                ContainerInfo(row["ID"], row["Names"], row["Image"], row["State"], row["Status"])
+            )
         return items
 
     def list_images(self) -> list[ImageInfo]:
@@ -254,9 +361,15 @@ class DockerEngine:
             images = engine.list_images()
             ```
         """
-        fmt = "{{.ID}}|{{.Repository}}|{{.Tag}}|{{.CreatedSince}}|{{.Size}}"
         out = self._run_docker(
-            ["image", "ls", "--filter", "label=safe_py_runner.managed=true", "--format", fmt]
+            [
+                "image",
+                "ls",
+                "--filter",
+                "label=safe_py_runner.managed=true",
+                "--format",
+                "{{json .}}",
+            ]
         )
         if out.returncode != 0:
             raise RuntimeError(f"Failed to list images: {out.stderr.strip()}")
@@ -264,8 +377,12 @@ class DockerEngine:
         for line in out.stdout.splitlines():
             if not line.strip():
                 continue
-            i_id, repo, tag, created, size = line.split("|", 4)
-            images.append(ImageInfo(i_id, repo, tag, created, size))
+            row = json_loads(line)
+            images.append(
+                ImageInfo(
+                    row["ID"], row["Repository"], row["Tag"], row["CreatedSince"], row["Size"]
+                )
+            )
         return images
 
     def stop_container(self, container_id: str, timeout_seconds: int = 10) -> None:
@@ -302,21 +419,53 @@ class DockerEngine:
             summary = engine.cleanup_stale()
             ```
         """
+        stale_ids = [
+            container.id
+            for container in self.list_containers(all_states=True)
+            if container.state != "running"
+        ]
+        refs = [f"{image.repository}:{image.tag}" for image in self.list_images()]
+        # Docker accepts many ids per call and echoes each one it removed, so a
+        # single invocation per resource type replaces one process per item.
         removed_containers = 0
-        for container in self.list_containers(all_states=True):
-            if container.state != "running":
-                removed = self._run_docker(["rm", "-f", container.id])
-                if removed.returncode == 0:
-                    removed_containers += 1
+        if stale_ids:
+            removed = self._run_docker(["rm", "-f", *stale_ids])
+            removed_lines = set(removed.stdout.split())
+            removed_containers = sum(1 for c_id in stale_ids if c_id in removed_lines)
 
         removed_images = 0
-        for image in self.list_images():
-            ref = f"{image.repository}:{image.tag}"
-            removed = self._run_docker(["image", "rm", ref])
-            if removed.returncode == 0:
-                removed_images += 1
+        if refs:
+            removed = self._run_docker(["image", "rm", *refs])
+            untagged = {
+                line.removeprefix("Untagged:").strip()
+                for line in removed.stdout.splitlines()
+                if line.startswith("Untagged:")
+            }
+            for ref in refs:
+                if ref in untagged:
+                    self._forget_image(ref)
+                    removed_images += 1
         return CleanupSummary(removed_containers=removed_containers, removed_images=removed_images)
 
+    def _probe_docker(self) -> tuple[bool, str | None]:
+        """Check Docker availability, reusing a recent successful probe.
+
+        Example:
+            ```python
+            ok, reason = engine._probe_docker()
+            ```
+        """
+        with self._probe_lock:
+            if time.monotonic() < self._probe_ok_until:
+                return True, None
+            available, reason = docker_is_available(
+                docker_env=self._env,
+                docker_context=self._docker_context,
+            )
+            if available:
+                self._probe_ok_until = time.monotonic() + DOCKER_PROBE_TTL_SECONDS
+            return available, reason
+
     def _ensure_managed_container(self, container_id: str) -> None:
         """Ensure a container is labeled as safe-py-runner managed.
 
@@ -359,18 +508,16 @@ class DockerEngine:
         )
 
     def _environment_key(self) -> str:
-        """Compute deterministic environment key for package-image caching.
+        """Return the deterministic environment key for package-image caching.
+
+        The key is computed once in `__init__` because its inputs never change.
 
         Example:
             ```python
             key = engine._environment_key()
             ```
         """
-        return env_hash(
-            python_version="3.11",
-            packages=self._packages,
-            namespace=self._name,
-        )
+        return self._env_key
 
     def _resolve_image(self) -> str:
         """Resolve runtime image using explicit, package, GHCR, then local fallback.
@@ -408,11 +555,48 @@ class DockerEngine:
             ok = engine._ensure_image_available("python:3.11-slim")
             ```
         """
-        inspected = self._run_docker(["image", "inspect", image])
-        if inspected.returncode == 0:
+        if self._image_known(image):
             return True
-        pulled = self._run_docker(["pull", image])
-        return pulled.returncode == 0
+        inspected = self._run_docker(["image", "inspect", image])
+        if inspected.returncode != 0:
+            pulled = self._run_docker(["pull", image])
+            if pulled.returncode != 0:
+                return False
+        self._remember_image(image)
+        return True
+
+    def _image_known(self, image: str) -> bool:
+        """Return True when this process already confirmed the image on the target.
+
+        Example:
+            ```python
+            cached = engine._image_known("python:3.11-slim")
+            ```
+        """
+        with _KNOWN_IMAGES_LOCK:
+            return (self._target, image) in _KNOWN_IMAGES
+
+    def _remember_image(self, image: str) -> None:
+        """Record that an image is present on the target.
+
+        Example:
+            ```python
+            engine._remember_image("python:3.11-slim")
+            ```
+        """
+        with _KNOWN_IMAGES_LOCK:
+            _KNOWN_IMAGES.add((self._target, image))
+
+    def _forget_image(self, image: str) -> None:
+        """Drop an image from the known-image cache after removal.
+
+        Example:
+            ```python
+            engine._forget_image("python:3.11-slim")
+            ```
+        """
+        with _KNOWN_IMAGES_LOCK:
+            _KNOWN_IMAGES.discard((self._target, image))
 
     def _build_local_runtime_image(self, tag: str) -> None:
         """Build local runtime image from repository Dockerfile.
@@ -428,6 +612,7 @@ class DockerEngine:
         )
         if built.returncode != 0:
             raise RuntimeError(f"Failed to build local runtime image: {built.stderr.strip()}")
+        self._remember_image(tag)
 
     def _ensure_package_image(self, tag: str) -> None:
         """Build or reuse a package-specific image identified by tag.
@@ -437,31 +622,33 @@ class DockerEngine:
             engine._ensure_package_image("safe-py-runner-env:abcd1234")
             ```
         """
+        if self._image_known(tag):
+            return
         if self._run_docker(["image", "inspect", tag]).returncode == 0:
+            self._remember_image(tag)
             return
-        root = _repo_root()
         base_image = DEFAULT_DOCKER_IMAGE if self._ensure_image_available(DEFAULT_DOCKER_IMAGE) else LOCAL_RUNTIME_IMAGE
         if base_image == LOCAL_RUNTIME_IMAGE:
             self._build_local_runtime_image(LOCAL_RUNTIME_IMAGE)
-        with tempfile.TemporaryDirectory(prefix="safe-py-runner-docker-build-") as tmp:
-            dockerfile = Path(tmp) / "Dockerfile"
-            labels = "\n".join(
-                [f'LABEL {k}="{v}"' for k, v in {**MANAGED_LABELS_BASE, "safe_py_runner.env_hash": self._environment_key()}.items()]
-            )
-            packages = " ".join(self._packages)
-            dockerfile.write_text(
-                (
-                    f"FROM {base_image}\n"
-                    f"{labels}\n"
-                    f"RUN python -m pip install {packages}\n"
-                ),
-                encoding="utf-8",
-            )
-            built = self._run_docker(["build", "-t", tag, "-f", str(dockerfile), str(root)])
-            if built.returncode != 0:
-                raise RuntimeError(f"Failed to build package image: {built.stderr.strip()}")
+        labels = "\n".join(
+            [f'LABEL {k}="{v}"' for k, v in self._labels.items()]
+        )
+        packages = " ".join(self._packages)
+        dockerfile = (
+            f"FROM {base_image}\n"
+            f"{labels}\n"
+            f"RUN python -m pip install {packages}\n"
+        )
+        # The Dockerfile needs no build context, so send it on stdin instead of
+        # writing a temp file and uploading the repository as context.
+        built = self._run_docker(["build", "-t", tag, "-"], input_text=dockerfile)
+        if built.returncode != 0:
+            raise RuntimeError(f"Failed to build package image: {built.stderr.strip()}")
+        self._remember_image(tag)
 
-    def _run_docker(self, args: list[str]) -> subprocess.CompletedProcess[str]:
+    def _run_docker(
+        self, args: list[str], *, input_text: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
         """Run a Docker CLI command against the configured target.
 
         Example:
@@ -475,20 +662,26 @@ class DockerEngine:
         cmd.extend(args)
         return subprocess.run(
             cmd,
+            input=input_text,
             capture_output=True,
             text=True,
             check=False,
-            env=self._docker_env(),
+            env=self._env,
         )
 
-    def _docker_env(self) -> dict[str, str]:
+    def _docker_env(self) -> dict[str, str] | None:
         """Build environment variables for Docker CLI targeting.
 
+        Returns `None` when no host or SSH override is configured, so Docker
+        subprocesses inherit the parent environment without a copy.
+
         Example:
             ```python
             env = engine._docker_env()
             ```
         """
+        if not self._docker_host and not self._ssh_host:
+            return None
         env = dict(os.environ)
         docker_host = self._docker_host
         if self._ssh_host:
@@ -497,7 +690,18 @@ class DockerEngine:
         if docker_host:
             env["DOCKER_HOST"] = docker_host
         if self._ssh_host:
-            parts = ["ssh"]
+            # Multiplex every Docker CLI call over one persistent SSH connection
+            # instead of paying a fresh handshake per command.
+            control_path = _ssh_control_dir() / "%C"
+            parts = [
+                "ssh",
+                "-o",
+                "ControlMaster=auto",
+                "-o",
+                f"ControlPath={control_path}",
+                "-o",
+                f"ControlPersist={SSH_CONTROL_PERSIST_SECONDS}",
+            ]
             if self._ssh_port:
                 parts.extend(["-p", str(self._ssh_port)])
             if self._ssh_key_path:
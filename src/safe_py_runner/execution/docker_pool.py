@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import atexit
 import subprocess
 import threading
 import time
-import uuid
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from secrets import token_hex
 from typing import Mapping
 
-from .config import DockerPoolSettings
+from .config import MANAGED_LABEL_VALUE, DockerPoolSettings
+
+ALIVE_REFRESH_SECONDS = 5.0
+WARM_MAX_WORKERS = 4
 
 
 @dataclass(slots=True)
 class ContainerLease:
     """Leased pooled container metadata.
 
+    `created_at` and `last_used_at` are `time.monotonic()` readings.
+
     Example:
         ```python
         lease = ContainerLease("safe-py-runner-a1", 0.0, 0.0, 0)
@@ -40,12 +48,42 @@ class _ContainerEntry:
     in_use: bool
 
 
+@dataclass(slots=True)
+class _Waiter:
+    """Queued acquirer that receives a released container directly.
+
+    Example:
+        ```python
+        waiter = _Waiter(settings=settings)
+        ```
+    """
+
+    settings: DockerPoolSettings
+    event: threading.Event = field(default_factory=threading.Event)
+    lease: ContainerLease | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _SweepTarget:
+    """Latest settings and Docker target the janitor uses for one image.
+
+    Example:
+        ```python
+        target = _SweepTarget(settings, docker_env=os.environ, docker_context=None)
+        ```
+    """
+
+    settings: DockerPoolSettings
+    docker_env: Mapping[str, str] | None
+    docker_context: str | None
+
+
 def should_rotate(lease: ContainerLease, settings: DockerPoolSettings, now: float) -> bool:
     """Decide whether a pooled container should be rotated.
 
     Example:
         ```python
-        rotate = should_rotate(lease, settings, now=time.time())
+        rotate = should_rotate(lease, settings, now=time.monotonic())
         ```
     """
     if lease.run_count >= settings.max_runs:
@@ -70,8 +108,28 @@ class DockerPool:
             pool = DockerPool()
             ```
         """
+        # `_lock` only guards the per-image maps; each image's entries and FIFO
+        # waiter queue are guarded by their own lock so unrelated images never
+        # contend. Released containers are handed straight to the oldest waiter.
         self._lock = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
         self._by_image: dict[str, list[_ContainerEntry]] = {}
+        self._waiters: dict[str, deque[_Waiter]] = {}
+        self._warming: dict[str, int] = {}
+        self._warmer = ThreadPoolExecutor(
+            max_workers=WARM_MAX_WORKERS,
+            thread_name_prefix="safe-py-runner-warm",
+        )
+        # Liveness checks and `docker rm -f` run on the janitor thread so
+        # removals never hold an image lock. `docker run` from `acquire()` is
+        # the one Docker call made under an image lock, which keeps the pool
+        # from overshooting `pool_size`. The janitor only runs while the pool
+        # holds containers and stops once it is empty.
+        self._targets: dict[str, _SweepTarget] = {}
+        self._pending_removals: list[tuple[str, Mapping[str, str] | None, str | None]] = []
+        self._janitor: threading.Thread | None = None
+        self._janitor_wake = threading.Event()
+        self._closed = False
 
     def acquire(
         self,
@@ -80,7 +138,7 @@ class DockerPool:
         settings: DockerPoolSettings,
         memory_limit_mb: int,
         labels: dict[str, str],
-        docker_env: Mapping[str, str],
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
     ) -> ContainerLease:
         """Acquire a running container lease for an image.
@@ -90,51 +148,58 @@ class DockerPool:
             lease = pool.acquire(image="safe-py-runner-runtime:local", settings=settings, memory_limit_mb=256, labels={}, docker_env=os.environ, docker_context=None)
             ```
         """
-        deadline = time.time() + settings.acquire_timeout
+        deadline = time.monotonic() + settings.acquire_timeout
+        lock, entries, waiters = self._image_state(image)
+        self._track_target(image, settings, docker_env, docker_context)
+        # Set when release() dropped a container and woke us to take its slot
+        # ahead of the remaining queue.
+        slot_freed = False
         while True:
-            with self._lock:
-                entries = self._by_image.setdefault(image, [])
-                self._rotate_locked(
-                    entries,
-                    settings,
-                    docker_env=docker_env,
-                    docker_context=docker_context,
-                )
-
-                for entry in entries:
-                    if entry.in_use:
-                        continue
-                    if not self._is_running(
-                        entry.lease.container_name,
-                        docker_env=docker_env,
-                        docker_context=docker_context,
-                    ):
-                        self._remove_entry_locked(
-                            entries,
-                            entry,
+            with lock:
+                if slot_freed or not waiters:
+                    now = time.monotonic()
+                    for entry in list(entries):
+                        if entry.in_use:
+                            continue
+                        if should_rotate(entry.lease, settings, now):
+                            self._remove_entry_locked(
+                                entries,
+                                entry,
+                                docker_env=docker_env,
+                                docker_context=docker_context,
+                            )
+                            continue
+                        entry.in_use = True
+                        return entry.lease
+
+                    if len(entries) + self._warming[image] < settings.pool_size:
+                        lease = self._create_container(
+                            image=image,
+                            memory_limit_mb=memory_limit_mb,
+                            labels=labels,
                             docker_env=docker_env,
                             docker_context=docker_context,
                         )
-                        continue
-                    entry.in_use = True
-                    return entry.lease
-
-                if len(entries) < settings.pool_size:
-                    lease = self._create_container(
-                        image=image,
-                        memory_limit_mb=memory_limit_mb,
-                        labels=labels,
-                        docker_env=docker_env,
-                        docker_context=docker_context,
-                    )
-                    entries.append(_ContainerEntry(lease=lease, in_use=True))
-                    return lease
-
-            if time.time() >= deadline:
+                        entries.append(_ContainerEntry(lease=lease, in_use=True))
+                        with self._lock:
+                            self._ensure_janitor_locked()
+                        return lease
+
+                waiter = _Waiter(settings=settings)
+                waiters.append(waiter)
+
+            waiter.event.wait(timeout=max(0.0, deadline - time.monotonic()))
+
+            with lock:
+                if waiter.lease is not None:
+                    return waiter.lease
+                slot_freed = waiter.event.is_set()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+            if not slot_freed and time.monotonic() >= deadline:
                 raise TimeoutError(
                     f"Timed out acquiring Docker container from pool after {settings.acquire_timeout}s"
                 )
-            time.sleep(0.05)
 
     def release(
         self,
@@ -147,77 +212,325 @@ class DockerPool:
     ) -> None:
         """Release a lease back to the pool and update rotation counters.
 
+        A healthy container goes straight to the oldest waiter, if any. When the
+        container is dropped instead, the oldest waiter is woken to retry.
+
         Example:
             ```python
             pool.release(image="img:tag", container_name="safe-py-runner-a1")
             ```
         """
-        env = docker_env or {}
-        with self._lock:
-            entries = self._by_image.get(image, [])
+        lock, entries, waiters = self._image_state(image)
+        with lock:
             for entry in list(entries):
                 if entry.lease.container_name != container_name:
                     continue
                 entry.in_use = False
-                entry.lease.last_used_at = time.time()
+                entry.lease.last_used_at = time.monotonic()
                 entry.lease.run_count += 1
-                if mark_bad:
+                if not waiters:
+                    if mark_bad:
+                        self._remove_entry_locked(
+                            entries,
+                            entry,
+                            docker_env=docker_env,
+                            docker_context=docker_context,
+                        )
+                    return
+                waiter = waiters.popleft()
+                if mark_bad or should_rotate(entry.lease, waiter.settings, time.monotonic()):
                     self._remove_entry_locked(
                         entries,
                         entry,
-                        docker_env=env,
+                        docker_env=docker_env,
                         docker_context=docker_context,
                     )
+                else:
+                    entry.in_use = True
+                    waiter.lease = entry.lease
+                waiter.event.set()
                 return
 
-    def _rotate_locked(
+    def ensure_warm(
         self,
-        entries: list[_ContainerEntry],
+        *,
+        image: str,
         settings: DockerPoolSettings,
+        memory_limit_mb: int,
+        labels: dict[str, str],
+        docker_env: Mapping[str, str] | None,
+        docker_context: str | None,
+    ) -> None:
+        """Start containers in the background until the image pool is full.
+
+        Example:
+            ```python
+            pool.ensure_warm(image="img:tag", settings=settings, memory_limit_mb=256, labels={}, docker_env=os.environ, docker_context=None)
+            ```
+        """
+        lock, entries, _ = self._image_state(image)
+        with lock:
+            missing = settings.pool_size - len(entries) - self._warming[image]
+            if missing <= 0 or self._closed:
+                return
+            self._warming[image] += missing
+        for _ in range(missing):
+            self._warmer.submit(
+                self._warm_one,
+                image=image,
+                memory_limit_mb=memory_limit_mb,
+                labels=dict(labels),
+                docker_env=docker_env,
+                docker_context=docker_context,
+            )
+
+    def _warm_one(
+        self,
         *,
-        docker_env: Mapping[str, str],
+        image: str,
+        memory_limit_mb: int,
+        labels: dict[str, str],
+        docker_env: Mapping[str, str] | None,
+        docker_context: str | None,
+    ) -> None:
+        """Create one warm container and hand it to a waiter or leave it idle.
+
+        Example:
+            ```python
+            pool._warm_one(image="img:tag", memory_limit_mb=256, labels={}, docker_env=os.environ, docker_context=None)
+            ```
+        """
+        lock, entries, waiters = self._image_state(image)
+        lease: ContainerLease | None = None
+        try:
+            lease = self._create_container(
+                image=image,
+                memory_limit_mb=memory_limit_mb,
+                labels=labels,
+                docker_env=docker_env,
+                docker_context=docker_context,
+            )
+        finally:
+            # Runs on any failure, not just RuntimeError, so the warming count
+            # never leaks and a queued waiter is never left asleep.
+            with lock:
+                self._warming[image] -= 1
+                if lease is None:
+                    if waiters:
+                        # Let the oldest waiter retry creating the container itself.
+                        waiters.popleft().event.set()
+                else:
+                    entry = _ContainerEntry(lease=lease, in_use=False)
+                    entries.append(entry)
+                    with self._lock:
+                        self._ensure_janitor_locked()
+                    if waiters:
+                        waiter = waiters.popleft()
+                        entry.in_use = True
+                        waiter.lease = lease
+                        waiter.event.set()
+
+    def _image_state(
+        self, image: str
+    ) -> tuple[threading.Lock, list[_ContainerEntry], deque[_Waiter]]:
+        """Return the lock, entries, and waiter queue for an image, creating them once.
+
+        Example:
+            ```python
+            lock, entries, waiters = pool._image_state("img:tag")
+            ```
+        """
+        with self._lock:
+            lock = self._locks.get(image)
+            if lock is None:
+                lock = self._locks[image] = threading.Lock()
+                self._by_image[image] = []
+                self._waiters[image] = deque()
+                self._warming[image] = 0
+            return lock, self._by_image[image], self._waiters[image]
+
+    def close(self) -> None:
+        """Stop background threads and remove idle and dropped containers.
+
+        Containers still leased to a caller are left running.
+
+        Example:
+            ```python
+            pool.close()
+            ```
+        """
+        with self._lock:
+            self._closed = True
+            janitor = self._janitor
+        self._janitor_wake.set()
+        if janitor is not None:
+            janitor.join()
+        self._warmer.shutdown(wait=True)
+        with self._lock:
+            targets = list(self._targets.items())
+        for image, target in targets:
+            lock, entries, _ = self._image_state(image)
+            with lock:
+                for entry in list(entries):
+                    if not entry.in_use:
+                        self._remove_entry_locked(
+                            entries,
+                            entry,
+                            docker_env=target.docker_env,
+                            docker_context=target.docker_context,
+                        )
+        self._drain_removals()
+
+    def _track_target(
+        self,
+        image: str,
+        settings: DockerPoolSettings,
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
     ) -> None:
-        """Rotate stale pooled containers that exceed run or TTL limits.
+        """Remember how the janitor should sweep an image.
+
+        Example:
+            ```python
+            pool._track_target("img:tag", settings, os.environ, None)
+            ```
+        """
+        with self._lock:
+            self._targets[image] = _SweepTarget(settings, docker_env, docker_context)
+
+    def _ensure_janitor_locked(self) -> None:
+        """Start the janitor thread unless it is running; caller holds `_lock`.
 
         Example:
             ```python
-            pool._rotate_locked(entries, settings, docker_env=os.environ, docker_context=None)
+            with pool._lock:
+                pool._ensure_janitor_locked()
             ```
         """
-        now = time.time()
-        for entry in list(entries):
-            if entry.in_use:
+        if self._janitor is None and not self._closed:
+            self._janitor = threading.Thread(
+                target=self._janitor_loop,
+                name="safe-py-runner-janitor",
+                daemon=True,
+            )
+            self._janitor.start()
+
+    def _janitor_loop(self) -> None:
+        """Sweep pooled containers every interval until the pool is closed or empty.
+
+        The thread exits once no containers are pooled or queued for removal;
+        the next container added to the pool starts a new one.
+
+        Example:
+            ```python
+            threading.Thread(target=pool._janitor_loop, daemon=True).start()
+            ```
+        """
+        while True:
+            self._janitor_wake.wait(timeout=self._sweep_interval())
+            self._janitor_wake.clear()
+            if self._closed:
+                return
+            try:
+                self._sweep()
+            except OSError:
+                # The Docker CLI went missing; keep entries and retry later.
                 continue
-            if should_rotate(entry.lease, settings, now):
-                self._remove_entry_locked(
-                    entries,
-                    entry,
-                    docker_env=docker_env,
-                    docker_context=docker_context,
-                )
+            with self._lock:
+                if not self._pending_removals and not any(self._by_image.values()):
+                    self._janitor = None
+                    return
+
+    def _sweep_interval(self) -> float:
+        """Return seconds between sweeps: a quarter of the shortest TTL, capped.
+
+        Example:
+            ```python
+            interval = pool._sweep_interval()
+            ```
+        """
+        with self._lock:
+            ttls = [target.settings.ttl_seconds for target in self._targets.values()]
+        return max(0.1, min([ALIVE_REFRESH_SECONDS, *(ttl / 4 for ttl in ttls)]))
+
+    def _sweep(self) -> None:
+        """Drop stale or stopped idle containers, then delete them without locks.
+
+        Example:
+            ```python
+            pool._sweep()
+            ```
+        """
+        with self._lock:
+            targets = list(self._targets.items())
+        for image, target in targets:
+            lock, entries, _ = self._image_state(image)
+            if not entries:
+                # Nothing to check, so skip the `docker ps` call.
+                continue
+            checked_at = time.monotonic()
+            running = self._running_container_names(
+                docker_env=target.docker_env,
+                docker_context=target.docker_context,
+            )
+            with lock:
+                now = time.monotonic()
+                for entry in list(entries):
+                    if entry.in_use:
+                        continue
+                    stopped = (
+                        running is not None
+                        and entry.lease.created_at < checked_at
+                        and entry.lease.container_name not in running
+                    )
+                    if stopped or should_rotate(entry.lease, target.settings, now):
+                        self._remove_entry_locked(
+                            entries,
+                            entry,
+                            docker_env=target.docker_env,
+                            docker_context=target.docker_context,
+                        )
+        self._drain_removals()
+
+    def _drain_removals(self) -> None:
+        """Force-remove containers queued by `_remove_entry_locked`.
+
+        Example:
+            ```python
+            pool._drain_removals()
+            ```
+        """
+        with self._lock:
+            pending, self._pending_removals = self._pending_removals, []
+        for container_name, docker_env, docker_context in pending:
+            self._stop_and_remove(
+                container_name,
+                docker_env=docker_env,
+                docker_context=docker_context,
+            )
 
     def _remove_entry_locked(
         self,
         entries: list[_ContainerEntry],
         entry: _ContainerEntry,
         *,
-        docker_env: Mapping[str, str],
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
     ) -> None:
-        """Remove a pooled entry and delete its backing container.
+        """Drop a pooled entry and queue its container for the janitor to delete.
 
         Example:
             ```python
             pool._remove_entry_locked(entries, entry, docker_env=os.environ, docker_context=None)
             ```
         """
-        self._stop_and_remove(
-            entry.lease.container_name,
-            docker_env=docker_env,
-            docker_context=docker_context,
-        )
         entries.remove(entry)
+        with self._lock:
+            self._pending_removals.append(
+                (entry.lease.container_name, docker_env, docker_context)
+            )
+            self._ensure_janitor_locked()
+        self._janitor_wake.set()
 
     def _create_container(
         self,
@@ -225,7 +538,7 @@ class DockerPool:
         image: str,
         memory_limit_mb: int,
         labels: dict[str, str],
-        docker_env: Mapping[str, str],
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
     ) -> ContainerLease:
         """Start a hardened runtime container and return its lease metadata.
@@ -235,10 +548,9 @@ class DockerPool:
             lease = pool._create_container(image="img:tag", memory_limit_mb=256, labels={}, docker_env=os.environ, docker_context=None)
             ```
         """
-        name = f"safe-py-runner-{uuid.uuid4().hex[:12]}"
+        name = f"safe-py-runner-{token_hex(6)}"
         mem_mb = max(128, int(memory_limit_mb))
         cmd = [
-            "docker",
             "run",
             "-d",
             "--rm",
@@ -266,44 +578,53 @@ class DockerPool:
             capture_output=True,
             text=True,
             check=False,
-            env=dict(docker_env),
+            env=docker_env,
         )
         if completed.returncode != 0:
             raise RuntimeError(f"Failed to start Docker container: {completed.stderr.strip()}")
-        now = time.time()
+        now = time.monotonic()
         return ContainerLease(container_name=name, created_at=now, last_used_at=now, run_count=0)
 
-    def _is_running(
+    def _running_container_names(
         self,
-        container_name: str,
         *,
-        docker_env: Mapping[str, str],
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
-    ) -> bool:
-        """Check if a specific container is running.
+    ) -> set[str] | None:
+        """List names of running managed containers with one Docker call.
+
+        Returns `None` when the listing fails so callers keep their entries.
 
         Example:
             ```python
-            running = pool._is_running("safe-py-runner-a1", docker_env=os.environ, docker_context=None)
+            names = pool._running_container_names(docker_env=os.environ, docker_context=None)
             ```
         """
         completed = subprocess.run(
             self._docker_cmd(
-                ["inspect", "-f", "{{.State.Running}}", container_name],
+                [
+                    "ps",
+                    "--filter",
+                    f"label=safe_py_runner.managed={MANAGED_LABEL_VALUE}",
+                    "--format",
+                    "{{.Names}}",
+                ],
                 docker_context=docker_context,
             ),
             capture_output=True,
             text=True,
             check=False,
-            env=dict(docker_env),
+            env=docker_env,
         )
-        return completed.returncode == 0 and completed.stdout.strip() == "true"
+        if completed.returncode != 0:
+            return None
+        return {line.strip() for line in completed.stdout.splitlines() if line.strip()}
 
     def _stop_and_remove(
         self,
         container_name: str,
         *,
-        docker_env: Mapping[str, str],
+        docker_env: Mapping[str, str] | None,
         docker_context: str | None,
     ) -> None:
         """Force-remove a specific container.
@@ -318,7 +639,7 @@ class DockerPool:
             capture_output=True,
             text=True,
             check=False,
-            env=dict(docker_env),
+            env=docker_env,
         )
 
     def _docker_cmd(self, args: list[str], *, docker_context: str | None) -> list[str]:
@@ -337,3 +658,6 @@ class DockerPool:
 
 
 GLOBAL_DOCKER_POOL = DockerPool()
+# Warm containers are started ahead of demand, so remove them when the
+# interpreter exits instead of leaving them for `spr cleanup`.
+atexit.register(GLOBAL_DOCKER_POOL.close)
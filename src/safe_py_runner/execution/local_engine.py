@@ -1,13 +1,29 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import os
+import selectors
 import subprocess
 import sys
+import threading
+import time
+import weakref
 from pathlib import Path
+from typing import Any, Self
 
 from .config import validate_pinned_packages
+from .serialization import json_dumps_bytes, json_loads
 from .types import ExecutionOutcome, ExecutionRequest
 
+# The persistent worker forks a fresh child per run, so it needs os.fork().
+PERSISTENT_WORKER_SUPPORTED = hasattr(os, "fork")
+# Extra time allowed for the worker to report a run it has already timed out.
+WORKER_REPLY_GRACE_SECONDS = 5.0
+
+# Environments already created and verified in this process, keyed by venv
+# directory and pinned package list.
+_ENV_READY_CACHE: set[tuple[str, tuple[str, ...]]] = set()
+
 
 def _worker_path() -> Path:
     """Return the absolute path to the worker module file.
@@ -20,12 +36,118 @@ def _worker_path() -> Path:
     return Path(__file__).resolve().parents[1] / "worker.py"
 
 
+def _outcome_from_reply(reply: dict[str, Any], request: ExecutionRequest) -> ExecutionOutcome:
+    """Convert one persistent worker reply into an execution outcome.
+
+    Example:
+        ```python
+        outcome = _outcome_from_reply({"stdout": "{}", "stderr": "", "returncode": 0, "timed_out": False}, request)
+        ```
+    """
+    if reply["timed_out"]:
+        return ExecutionOutcome(
+            stdout="",
+            stderr="",
+            returncode=124,
+            timed_out=True,
+            error=f"Execution timed out after {request.timeout_seconds}s",
+        )
+    return ExecutionOutcome(
+        stdout=reply["stdout"],
+        stderr=reply["stderr"],
+        returncode=reply["returncode"],
+        timed_out=False,
+    )
+
+
+def _unresponsive_outcome() -> ExecutionOutcome:
+    """Return the outcome reported when the persistent worker stops replying.
+
+    Example:
+        ```python
+        outcome = _unresponsive_outcome()
+        ```
+    """
+    return ExecutionOutcome(
+        stdout="",
+        stderr="",
+        returncode=125,
+        timed_out=False,
+        error="Local worker stopped responding",
+    )
+
+
+def _max_output_bytes(request: ExecutionRequest) -> int:
+    """Return the policy output cap for a request in bytes.
+
+    Example:
+        ```python
+        limit = _max_output_bytes(ExecutionRequest(payload={"policy": {"max_output_kb": 64}}, timeout_seconds=5))
+        ```
+    """
+    return int(request.payload.get("policy", {}).get("max_output_kb", 128)) * 1024
+
+
+def _collect_output(
+    out_fd: int, err_fd: int, *, deadline: float, stderr_limit: int
+) -> tuple[bytes, bytes]:
+    """Read a worker's stdout and stderr to EOF on this thread.
+
+    Stderr beyond `stderr_limit` bytes is drained and dropped. Stdout is the
+    worker's JSON response, which the worker already bounds by policy.
+    Raises `TimeoutError` when the deadline passes first.
+
+    Example:
+        ```python
+        out, err = _collect_output(proc.stdout.fileno(), proc.stderr.fileno(), deadline=time.monotonic() + 5, stderr_limit=131072)
+        ```
+    """
+    out: list[bytes] = []
+    err = bytearray()
+    with selectors.DefaultSelector() as selector:
+        selector.register(out_fd, selectors.EVENT_READ)
+        selector.register(err_fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            for key, _ in selector.select(timeout=remaining):
+                data = os.read(key.fd, 65536)
+                if not data:
+                    selector.unregister(key.fd)
+                elif key.fd == out_fd:
+                    out.append(data)
+                elif len(err) < stderr_limit:
+                    err += data[: stderr_limit - len(err)]
+    return b"".join(out), bytes(err)
+
+
+def _kill_worker(worker: subprocess.Popen[bytes]) -> None:
+    """Kill and reap a persistent worker process and close its pipes.
+
+    Example:
+        ```python
+        _kill_worker(worker)
+        ```
+    """
+    worker.kill()
+    worker.wait()
+    for stream in (worker.stdin, worker.stdout):
+        if stream is not None:
+            stream.close()
+
+
 class LocalEngine:
     """Execute code locally using a managed virtual environment.
 
+    The persistent worker is stopped by `close()`, when the engine is used
+    as a context manager and the block exits, or when the engine is garbage
+    collected or the interpreter exits.
+
     Example:
         ```python
-        engine = LocalEngine(venv_dir="/tmp/my_env", venv_manager="uv")
+        with LocalEngine(venv_dir="/tmp/my_env", venv_manager="uv") as engine:
+            outcome = engine.execute(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
         ```
     """
 
@@ -50,26 +172,275 @@ class LocalEngine:
         self._venv_manager = venv_manager
         self._packages = validate_pinned_packages(packages)
         self._prepare_environment()
+        # One long-lived worker started on first use; concurrent calls that
+        # find it busy fall back to a one-shot worker process.
+        self._worker: subprocess.Popen[bytes] | None = None
+        self._worker_finalizer: (
+            weakref.finalize[[subprocess.Popen[bytes]], LocalEngine] | None
+        ) = None
+        self._worker_lock = threading.Lock()
+        self._sent_policy: bytes | None = None
 
     def execute(self, request: ExecutionRequest) -> ExecutionOutcome:
         """Execute one request in the local venv worker process.
 
+        Runs go through the persistent worker when the platform supports it
+        and the worker is idle; otherwise a one-shot worker is spawned.
+
         Example:
             ```python
             outcome = engine.execute(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
             ```
         """
-        cmd = [str(self._python_path()), str(_worker_path())]
+        if PERSISTENT_WORKER_SUPPORTED and self._worker_lock.acquire(blocking=False):
+            try:
+                outcome = self._execute_persistent(request)
+            finally:
+                self._worker_lock.release()
+            if outcome is not None:
+                return outcome
+        return self._execute_once(request)
+
+    def execute_batch(self, requests: list[ExecutionRequest]) -> list[ExecutionOutcome]:
+        """Execute several requests with one round-trip to the persistent worker.
+
+        Each request still runs in its own forked child under its own timeout;
+        outcomes are returned in request order.
+
+        Example:
+            ```python
+            outcomes = engine.execute_batch([ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5)])
+            ```
+        """
+        if not requests:
+            return []
+        if PERSISTENT_WORKER_SUPPORTED and self._worker_lock.acquire(blocking=False):
+            try:
+                replies = self._exchange(requests, batch=True)
+            except TimeoutError:
+                return [_unresponsive_outcome() for _ in requests]
+            finally:
+                self._worker_lock.release()
+            if replies is not None:
+                return [
+                    _outcome_from_reply(reply, request)
+                    for reply, request in zip(replies, requests, strict=True)
+                ]
+        return [self._execute_once(request) for request in requests]
+
+    def close(self) -> None:
+        """Stop the persistent worker process, if one is running.
+
+        Example:
+            ```python
+            engine.close()
+            ```
+        """
+        with self._worker_lock:
+            self._stop_worker()
+
+    def __enter__(self) -> Self:
+        """Return the engine for use in a `with` block.
+
+        Example:
+            ```python
+            with LocalEngine(venv_dir="/tmp/my_env") as engine:
+                ...
+            ```
+        """
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the persistent worker when the `with` block exits.
+
+        Example:
+            ```python
+            engine.__exit__(None, None, None)
+            ```
+        """
+        self.close()
+
+    def _execute_persistent(self, request: ExecutionRequest) -> ExecutionOutcome | None:
+        """Send one request to the persistent worker and wait for its reply.
+
+        Returns `None` when the request could not be delivered, so the caller
+        can run it in a one-shot worker instead.
+
+        Example:
+            ```python
+            outcome = engine._execute_persistent(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
+            ```
+        """
+        try:
+            replies = self._exchange([request], batch=False)
+        except TimeoutError:
+            return _unresponsive_outcome()
+        if replies is None:
+            return None
+        return _outcome_from_reply(replies[0], request)
+
+    def _exchange(
+        self, requests: list[ExecutionRequest], *, batch: bool
+    ) -> list[dict[str, Any]] | None:
+        """Send requests to the persistent worker in one line and parse the replies.
+
+        Returns `None` when the line could not be delivered. Raises
+        `TimeoutError` after stopping the worker when no reply arrives.
+
+        Example:
+            ```python
+            replies = engine._exchange([ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5)], batch=False)
+            ```
+        """
+        try:
+            worker = self._ensure_worker()
+            try:
+                frames = [self._worker_frame(request) for request in requests]
+                line: dict[str, Any] = {"batch": frames} if batch else frames[0]
+                data = json_dumps_bytes(line) + b"\n"
+            except BaseException:
+                # A frame may have recorded a policy the worker never received;
+                # forget it so the next run sends its policy in full.
+                self._sent_policy = None
+                raise
+            assert worker.stdin is not None
+            worker.stdin.write(data)
+            worker.stdin.flush()
+        except OSError:
+            self._stop_worker()
+            return None
+        reply_timeout = sum(frame["timeout_seconds"] for frame in frames)
+        raw = self._read_reply(worker, reply_timeout + WORKER_REPLY_GRACE_SECONDS)
+        if raw is None:
+            self._stop_worker()
+            raise TimeoutError("Local worker stopped responding")
+        reply: dict[str, Any] = json_loads(raw)
+        return reply["results"] if batch else [reply]
+
+    def _worker_frame(self, request: ExecutionRequest) -> dict[str, Any]:
+        """Build the persistent worker frame for one request.
+
+        The worker remembers the last policy it received, so a policy equal to
+        the previous one is replaced by a `reuse_policy` flag. Policies are
+        compared by their encoded form, so a policy dict mutated in place
+        between calls is still sent again.
+
+        Example:
+            ```python
+            frame = engine._worker_frame(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
+            ```
+        """
+        payload = request.payload
+        frame: dict[str, Any] = {"timeout_seconds": max(1, int(request.timeout_seconds))}
+        policy = payload.get("policy")
+        encoded = None if policy is None else json_dumps_bytes(policy)
+        if encoded is not None and encoded == self._sent_policy:
+            frame["payload"] = {key: value for key, value in payload.items() if key != "policy"}
+            frame["reuse_policy"] = True
+        else:
+            frame["payload"] = payload
+            self._sent_policy = encoded
+        return frame
+
+    def _ensure_worker(self) -> subprocess.Popen[bytes]:
+        """Return the running persistent worker, starting it when needed.
+
+        Example:
+            ```python
+            worker = engine._ensure_worker()
+            ```
+        """
+        if self._worker is not None and self._worker.poll() is None:
+            return self._worker
+        self._stop_worker()
+        # No preexec_fn, cwd, or session changes: CPython can launch this with
+        # vfork()/posix_spawn(), so a large host process pays no page-table
+        # copy. Keep close_fds at its default so untrusted code inherits
+        # nothing beyond its pipes.
+        self._worker = subprocess.Popen(
+            [str(self._python_path()), str(_worker_path()), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        # Reaps the worker if the engine is dropped or the interpreter exits
+        # without close(); holds the process, never the engine.
+        self._worker_finalizer = weakref.finalize(self, _kill_worker, self._worker)
+        return self._worker
+
+    def _read_reply(self, worker: subprocess.Popen[bytes], timeout: float) -> bytes | None:
+        """Read one reply line from the worker, or `None` on EOF or timeout.
+
+        Example:
+            ```python
+            line = engine._read_reply(worker, timeout=10)
+            ```
+        """
+        assert worker.stdout is not None
+        fd = worker.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        chunks: list[bytes] = []
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(timeout=remaining):
+                    return None
+                data = os.read(fd, 65536)
+                if not data:
+                    return None
+                chunks.append(data)
+                if data.endswith(b"\n"):
+                    return b"".join(chunks)
+
+    def _stop_worker(self) -> None:
+        """Kill and reap the persistent worker process.
+
+        Example:
+            ```python
+            engine._stop_worker()
+            ```
+        """
+        finalizer, self._worker_finalizer = self._worker_finalizer, None
+        self._worker = None
+        self._sent_policy = None
+        if finalizer is not None:
+            finalizer()
+
+    def _execute_once(self, request: ExecutionRequest) -> ExecutionOutcome:
+        """Execute one request in a freshly spawned worker process.
+
+        Example:
+            ```python
+            outcome = engine._execute_once(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
+            ```
+        """
+        timeout_seconds = max(1, int(request.timeout_seconds))
+        proc = subprocess.Popen(
+            [str(self._python_path()), str(_worker_path())],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        assert proc.stdin is not None and proc.stdout is not None and proc.stderr is not None
+        try:
+            proc.stdin.write(json_dumps_bytes(request.payload))
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
         try:
-            completed = subprocess.run(
-                cmd,
-                input=json.dumps(request.payload),
-                capture_output=True,
-                text=True,
-                timeout=max(1, int(request.timeout_seconds)),
-                check=False,
+            stdout, stderr = _collect_output(
+                proc.stdout.fileno(),
+                proc.stderr.fileno(),
+                deadline=time.monotonic() + timeout_seconds,
+                stderr_limit=_max_output_bytes(request),
             )
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
+            proc.kill()
             return ExecutionOutcome(
                 stdout="",
                 stderr="",
@@ -77,10 +448,14 @@ class LocalEngine:
                 timed_out=True,
                 error=f"Execution timed out after {request.timeout_seconds}s",
             )
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+            returncode = proc.wait()
         return ExecutionOutcome(
-            stdout=completed.stdout,
-            stderr=completed.stderr,
-            returncode=completed.returncode,
+            stdout=stdout.decode("utf-8", "replace"),
+            stderr=stderr.decode("utf-8", "replace"),
+            returncode=returncode,
             timed_out=False,
         )
 
@@ -92,6 +467,12 @@ class LocalEngine:
             engine._prepare_environment()
             ```
         """
+        key = (str(self._venv_dir), tuple(self._packages))
+        # One stat keeps the cache honest if the venv was deleted meanwhile.
+        if key in _ENV_READY_CACHE:
+            if self._python_path().is_file():
+                return
+            _ENV_READY_CACHE.discard(key)
         self._venv_dir.mkdir(parents=True, exist_ok=True)
         py_path = self._python_path()
         if not py_path.exists():
@@ -116,9 +497,11 @@ class LocalEngine:
             else:
                 raise ValueError("venv_manager must be either 'uv' or 'python'")
         if self._packages:
-            marker = self._venv_dir / ".safe_py_runner_packages.txt"
             desired = "\n".join(self._packages) + "\n"
-            if not marker.exists() or marker.read_text(encoding="utf-8") != desired:
+            # The marker name encodes the package set, so checking it is a stat.
+            digest = hashlib.sha256(desired.encode("utf-8")).hexdigest()[:12]
+            marker = self._venv_dir / f".safe_py_runner_packages.{digest}"
+            if not marker.exists():
                 installed = subprocess.run(
                     [str(self._python_path()), "-m", "pip", "install", *self._packages],
                     capture_output=True,
@@ -127,7 +510,10 @@ class LocalEngine:
                 )
                 if installed.returncode != 0:
                     raise RuntimeError(f"Failed to install local packages: {installed.stderr.strip()}")
+                for stale in self._venv_dir.glob(".safe_py_runner_packages.*"):
+                    stale.unlink()
                 marker.write_text(desired, encoding="utf-8")
+        _ENV_READY_CACHE.add(key)
 
     def _python_path(self) -> Path:
         """Return the Python executable path inside the managed venv.
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, fields
+from typing import Any
+
+_orjson: Any
+try:
+    import orjson as _orjson_module  # optional speedup, see the `fast` extra
+    _orjson = _orjson_module
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
+
+_msgspec: Any
+try:
+    import msgspec as _msgspec_module  # optional speedup, see the `fast` extra
+    _msgspec = _msgspec_module
+except ImportError:  # pragma: no cover - depends on environment
+    _msgspec = None
+
+
+@dataclass(slots=True)
+class WorkerResult:
+    """Result document the worker prints to stdout.
+
+    Example:
+        ```python
+        parsed = WorkerResult(ok=True, result=2)
+        ```
+    """
+
+    ok: bool = False
+    result: Any = None
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+    resource_exceeded: bool = False
+    error: str | None = None
+
+
+_WORKER_RESULT_FIELDS = tuple(item.name for item in fields(WorkerResult))
+_WORKER_RESULT_COERCIONS: tuple[tuple[str, type], ...] = (
+    ("ok", bool),
+    ("stdout", str),
+    ("stderr", str),
+    ("timed_out", bool),
+    ("resource_exceeded", bool),
+)
+_WORKER_RESULT_DECODER = (
+    _msgspec.json.Decoder(type=WorkerResult) if _msgspec is not None else None
+)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed.
+
+    Example:
+        ```python
+        row = json_loads('{"ID": "abc"}')
+        ```
+    """
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    """Serialize a value to compact UTF-8 JSON bytes with the stdlib encoder.
+
+    orjson is not used for requests: it writes `NaN` and infinities as `null`
+    and rejects integers wider than 64 bits, so `input_data` would reach the
+    worker differently depending on which extras are installed.
+
+    Example:
+        ```python
+        data = json_dumps_bytes({"code": "result = 1"})
+        ```
+    """
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_worker_result(data: str | bytes) -> WorkerResult:
+    """Parse worker stdout into a `WorkerResult`.
+
+    With msgspec installed, well-typed output is decoded straight into the
+    dataclass without building an intermediate dict. Anything msgspec rejects
+    goes through the stdlib path, which coerces only fields whose JSON type
+    does not match. That path always uses stdlib `json.loads` (never orjson)
+    so results such as `NaN`, `Infinity`, and integers wider than 64 bits
+    come back exactly as the worker wrote them. Raises `ValueError` for
+    malformed JSON and `TypeError` when the data is not a JSON object.
+
+    Example:
+        ```python
+        parsed = decode_worker_result('{"ok": true, "result": 2}')
+        ```
+    """
+    if _WORKER_RESULT_DECODER is not None:
+        try:
+            decoded: WorkerResult = _WORKER_RESULT_DECODER.decode(data)
+            return decoded
+        except _msgspec.DecodeError:
+            pass
+    parsed = json.loads(data)
+    if not isinstance(parsed, dict):
+        raise TypeError("Worker result must be a JSON object")
+    values = {name: parsed[name] for name in _WORKER_RESULT_FIELDS if name in parsed}
+    # The worker emits canonical types, so coercion only runs on odd output.
+    for name, kind in _WORKER_RESULT_COERCIONS:
+        if name in values and type(values[name]) is not kind:
+            values[name] = kind(values[name])
+    return WorkerResult(**values)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import copy
 import tomllib
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+VALID_MODES = frozenset({"allow", "restrict"})
+
 
 def _default_policy_path() -> Path:
     """Return bundled default policy TOML path.
@@ -20,12 +25,20 @@ def _default_policy_path() -> Path:
 def _read_policy_toml(path: Path) -> dict[str, Any]:
     """Read policy TOML and return normalized policy dictionary.
 
+    Parsed files are cached by resolved path, inode, size, and modification
+    and change times, so repeated reads of an unchanged file skip the read
+    and parse. Callers must not mutate the returned dictionary.
+
     Example:
         ```python
         raw = _read_policy_toml(Path("/tmp/policy.toml"))
         ```
     """
-    if not path.exists():
+    try:
+        # Resolve first so a relative path never hits another directory's entry.
+        path = path.resolve()
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
         return {
             "mode": "restrict",
             "timeout_seconds": 5,
@@ -38,7 +51,23 @@ def _read_policy_toml(path: Path) -> dict[str, Any]:
             "allowed_globals": [],
             "blocked_globals": [],
         }
-    raw = tomllib.loads(path.read_text(encoding="utf-8"))
+    return _parse_policy_toml(
+        str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns
+    )
+
+
+@lru_cache(maxsize=32)
+def _parse_policy_toml(
+    path: str, inode: int, size: int, mtime_ns: int, ctime_ns: int
+) -> dict[str, Any]:
+    """Parse one version of a policy TOML file; the stat fields key the cache.
+
+    Example:
+        ```python
+        raw = _parse_policy_toml("/tmp/policy.toml", 42, 120, 1700000000000000000, 1700000000000000000)
+        ```
+    """
+    raw = tomllib.loads(Path(path).read_text(encoding="utf-8"))
     policy_obj = raw.get("policy", raw)
     if not isinstance(policy_obj, dict):
         raise ValueError("Policy config must be a TOML table")
@@ -70,23 +99,23 @@ DEFAULT_MODE = str(_DEFAULT_POLICY_RAW.get("mode", "restrict"))
 DEFAULT_TIMEOUT_SECONDS = int(_DEFAULT_POLICY_RAW.get("timeout_seconds", 5))
 DEFAULT_MEMORY_LIMIT_MB = int(_DEFAULT_POLICY_RAW.get("memory_limit_mb", 256))
 DEFAULT_MAX_OUTPUT_KB = int(_DEFAULT_POLICY_RAW.get("max_output_kb", 128))
-DEFAULT_BLOCKED_IMPORTS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("blocked_imports", []), "blocked_imports"
+DEFAULT_BLOCKED_IMPORTS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("blocked_imports", []), "blocked_imports")
 )
-DEFAULT_BLOCKED_BUILTINS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("blocked_builtins", []), "blocked_builtins"
+DEFAULT_BLOCKED_BUILTINS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("blocked_builtins", []), "blocked_builtins")
 )
-DEFAULT_ALLOWED_IMPORTS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("allowed_imports", []), "allowed_imports"
+DEFAULT_ALLOWED_IMPORTS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("allowed_imports", []), "allowed_imports")
 )
-DEFAULT_ALLOWED_BUILTINS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("allowed_builtins", []), "allowed_builtins"
+DEFAULT_ALLOWED_BUILTINS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("allowed_builtins", []), "allowed_builtins")
 )
-DEFAULT_ALLOWED_GLOBALS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("allowed_globals", []), "allowed_globals"
+DEFAULT_ALLOWED_GLOBALS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("allowed_globals", []), "allowed_globals")
 )
-DEFAULT_BLOCKED_GLOBALS = _list_of_str(
-    _DEFAULT_POLICY_RAW.get("blocked_globals", []), "blocked_globals"
+DEFAULT_BLOCKED_GLOBALS = tuple(
+    _list_of_str(_DEFAULT_POLICY_RAW.get("blocked_globals", []), "blocked_globals")
 )
 
 
@@ -94,6 +123,8 @@ DEFAULT_BLOCKED_GLOBALS = _list_of_str(
 class RunnerPolicy:
     """Execution policy for untrusted Python code.
 
+    List fields default to shared tuples; pass a new sequence to change one.
+
     Example:
         ```python
         policy = RunnerPolicy(timeout_seconds=5, blocked_imports=["os"])
@@ -104,12 +135,12 @@ class RunnerPolicy:
     timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS
     memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB
     max_output_kb: int = DEFAULT_MAX_OUTPUT_KB
-    allowed_imports: list[str] = field(default_factory=lambda: DEFAULT_ALLOWED_IMPORTS.copy())
-    blocked_imports: list[str] = field(default_factory=lambda: DEFAULT_BLOCKED_IMPORTS.copy())
-    allowed_builtins: list[str] = field(default_factory=lambda: DEFAULT_ALLOWED_BUILTINS.copy())
-    blocked_builtins: list[str] = field(default_factory=lambda: DEFAULT_BLOCKED_BUILTINS.copy())
-    allowed_globals: list[str] = field(default_factory=lambda: DEFAULT_ALLOWED_GLOBALS.copy())
-    blocked_globals: list[str] = field(default_factory=lambda: DEFAULT_BLOCKED_GLOBALS.copy())
+    allowed_imports: Sequence[str] = DEFAULT_ALLOWED_IMPORTS
+    blocked_imports: Sequence[str] = DEFAULT_BLOCKED_IMPORTS
+    allowed_builtins: Sequence[str] = DEFAULT_ALLOWED_BUILTINS
+    blocked_builtins: Sequence[str] = DEFAULT_BLOCKED_BUILTINS
+    allowed_globals: Sequence[str] = DEFAULT_ALLOWED_GLOBALS
+    blocked_globals: Sequence[str] = DEFAULT_BLOCKED_GLOBALS
     extra_globals: dict[str, Any] = field(default_factory=dict)
     config_path: str | None = None
 
@@ -121,7 +152,7 @@ class RunnerPolicy:
             RunnerPolicy(mode="restrict")
             ```
         """
-        if self.mode not in {"allow", "restrict"}:
+        if self.mode not in VALID_MODES:
             raise ValueError("mode must be 'allow' or 'restrict'")
 
     @classmethod
@@ -152,7 +183,7 @@ class RunnerPolicy:
             ),
             allowed_globals=_list_of_str(raw.get("allowed_globals", []), "allowed_globals"),
             blocked_globals=_list_of_str(raw.get("blocked_globals", []), "blocked_globals"),
-            extra_globals=extra_globals_raw,
+            extra_globals=copy.deepcopy(extra_globals_raw),
             config_path=config_path,
         )
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from .execution.capabilities import preflight_validate_backend_capabilities
 from .execution.engine import ExecutionEngine
+from .execution.serialization import decode_worker_result
 from .execution.types import ExecutionRequest
 from .policy import RunnerPolicy, RunnerResult
 
@@ -44,12 +44,12 @@ def _build_payload(code: str, input_data: dict[str, Any] | None, policy: RunnerP
             "timeout_seconds": policy.timeout_seconds,
             "memory_limit_mb": policy.memory_limit_mb,
             "max_output_kb": policy.max_output_kb,
-            "allowed_imports": policy.allowed_imports,
-            "blocked_imports": policy.blocked_imports,
-            "allowed_builtins": policy.allowed_builtins,
-            "blocked_builtins": policy.blocked_builtins,
-            "allowed_globals": policy.allowed_globals,
-            "blocked_globals": policy.blocked_globals,
+            "allowed_imports": list(policy.allowed_imports),
+            "blocked_imports": list(policy.blocked_imports),
+            "allowed_builtins": list(policy.allowed_builtins),
+            "blocked_builtins": list(policy.blocked_builtins),
+            "allowed_globals": list(policy.allowed_globals),
+            "blocked_globals": list(policy.blocked_globals),
             "extra_globals": policy.extra_globals,
         },
     }
@@ -89,7 +89,10 @@ def run_code(
             exit_code=124,
         )
 
-    if outcome.error and not outcome.stdout.strip():
+    # JSON parsers skip surrounding whitespace, so stdout is only checked for
+    # blankness here instead of being stripped into a copy.
+    has_output = bool(outcome.stdout) and not outcome.stdout.isspace()
+    if outcome.error and not has_output:
         return RunnerResult(
             ok=False,
             error=outcome.error,
@@ -97,10 +100,10 @@ def run_code(
             exit_code=outcome.returncode,
         )
 
-    raw = outcome.stdout.strip() or "{}"
+    raw = outcome.stdout if has_output else "{}"
     try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
+        parsed = decode_worker_result(raw)
+    except (TypeError, ValueError):
         return RunnerResult(
             ok=False,
             error="Runner returned invalid JSON",
@@ -109,12 +112,12 @@ def run_code(
         )
 
     return RunnerResult(
-        ok=bool(parsed.get("ok")),
-        result=parsed.get("result"),
-        stdout=str(parsed.get("stdout", "")),
-        stderr=str(parsed.get("stderr", "")) or outcome.stderr,
-        timed_out=bool(parsed.get("timed_out", False)),
-        resource_exceeded=bool(parsed.get("resource_exceeded", False)),
-        error=parsed.get("error") or outcome.error,
+        ok=parsed.ok,
+        result=parsed.result,
+        stdout=parsed.stdout,
+        stderr=parsed.stderr or outcome.stderr,
+        timed_out=parsed.timed_out,
+        resource_exceeded=parsed.resource_exceeded,
+        error=parsed.error or outcome.error,
         exit_code=outcome.returncode,
     )
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import contextlib
 import io
 import json
+import os
+import selectors
+import signal
 import sys
+import time
 import traceback
+from functools import lru_cache
 from typing import Any, Callable
 
 _resource: Any
@@ -14,6 +18,90 @@ try:
 except Exception:  # pragma: no cover - platform specific
     _resource = None
 
+VALID_MODES = frozenset({"allow", "restrict"})
+# Names input_data keys may never shadow when injected as globals.
+_RESERVED_INPUT_KEYS = frozenset(
+    {
+        "__builtins__",
+        "input_data",
+        "result",
+        "_print_",
+        "_getattr_",
+        "_write_",
+        "_getiter_",
+        "_getitem_",
+        "_iter_unpack_sequence_",
+        "_unpack_sequence_",
+    }
+)
+
+# Policy of the last served frame, reused by frames flagged `reuse_policy`.
+_served_policy: Any = None
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with the stdlib decoder.
+
+    orjson is deliberately not used here: it rejects `NaN`/`Infinity` and
+    turns integers wider than 64 bits into floats, so the same request would
+    parse differently depending on what the user's venv has installed.
+
+    Example:
+        ```python
+        req = _loads(b'{"code": "result = 1"}')
+        ```
+    """
+    return json.loads(data)
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a response to JSON bytes, stringifying unsupported values.
+
+    Always uses the stdlib encoder so responses match `json.dumps(value,
+    default=str)` whether or not orjson is installed in the user's venv.
+
+    Example:
+        ```python
+        data = _dumps({"ok": True, "result": 2})
+        ```
+    """
+    try:
+        text = json.dumps(value, separators=(",", ":"))
+    except TypeError:
+        # Only responses carrying non-JSON values pay for the coercion walk.
+        text = json.dumps(_jsonify(value), separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def _jsonify(value: Any) -> Any:
+    """Recursively replace values json cannot encode with their `str()`.
+
+    Example:
+        ```python
+        assert _jsonify({"obj": range(2)}) == {"obj": "range(0, 2)"}
+        ```
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {key: _jsonify(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonify(item) for item in value]
+    return str(value)
+
+
+def _emit(response: dict[str, Any]) -> None:
+    """Write one JSON response to stdout as bytes.
+
+    Example:
+        ```python
+        _emit({"ok": True, "result": 2})
+        ```
+    """
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(response))
+    sys.stdout.buffer.flush()
+
 
 def _inject_input_keys(
     exec_globals: dict[str, Any],
@@ -29,30 +117,68 @@ def _inject_input_keys(
     """
     if not isinstance(input_data, dict):
         return
-    reserved = {
-        "__builtins__",
-        "input_data",
-        "result",
-        "_print_",
-        "_getattr_",
-        "_write_",
-        "_getiter_",
-        "_getitem_",
-        "_iter_unpack_sequence_",
-        "_unpack_sequence_",
-    }
+    # Keys arrive from JSON, so they are already strings.
+    allow_mode = mode == "allow"
     for key, value in input_data.items():
-        key_str = str(key)
-        if not key_str.isidentifier():
-            continue
-        if key_str in reserved or key_str.startswith("_"):
-            continue
-        if mode == "allow" and key_str not in allowed_globals:
+        if allow_mode:
+            if key not in allowed_globals:
+                continue
+        elif key in blocked_globals:
             continue
-        if mode == "restrict" and key_str in blocked_globals:
+        if key.startswith("_") or key in _RESERVED_INPUT_KEYS or not key.isidentifier():
             continue
-        if key_str not in exec_globals:
-            exec_globals[key_str] = value
+        exec_globals.setdefault(key, value)
+
+
+class _BoundedStringIO(io.StringIO):
+    """Text buffer that keeps only the first `limit` characters written.
+
+    Writes past the limit are dropped, so memory stays bounded by policy no
+    matter how much user code prints.
+
+    Example:
+        ```python
+        buffer = _BoundedStringIO(limit=4)
+        buffer.write("hello")  # keeps "hell"
+        ```
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Create an empty buffer holding at most `limit` characters.
+
+        Example:
+            ```python
+            buffer = _BoundedStringIO(limit=128 * 1024)
+            ```
+        """
+        super().__init__()
+        self._remaining = max(0, limit)
+
+    @property
+    def remaining(self) -> int:
+        """Number of characters the buffer will still keep.
+
+        Example:
+            ```python
+            if buffer.remaining:
+                buffer.write("more")
+            ```
+        """
+        return self._remaining
+
+    def write(self, s: str) -> int:
+        """Store as much of `s` as fits and report it as fully written.
+
+        Example:
+            ```python
+            written = buffer.write("text")
+            ```
+        """
+        if self._remaining:
+            kept = s[: self._remaining]
+            self._remaining -= len(kept)
+            super().write(kept)
+        return len(s)
 
 
 def _set_limits(memory_limit_mb: int) -> list[str]:
@@ -96,6 +222,20 @@ def _safe_import_factory_mode(
         safe_import = _safe_import_factory_mode("restrict", set(), {"os"})
         ```
     """
+    if mode == "allow":
+        return _safe_import_factory_allow(frozenset(allowed_imports))
+    return _safe_import_factory_restrict(frozenset(blocked_imports))
+
+
+def _safe_import_factory_allow(allowed: frozenset[str]) -> Callable[..., Any]:
+    """Create an import hook that only admits allow-listed root packages.
+
+    Example:
+        ```python
+        safe_import = _safe_import_factory_allow(frozenset({"math"}))
+        ```
+    """
+
     def _safe_import(
         name: str,
         globals: dict[str, Any] | None = None,
@@ -103,21 +243,50 @@ def _safe_import_factory_mode(
         fromlist: Any = (),
         level: int = 0,
     ) -> Any:
-        """Import hook that enforces configured import policy.
+        """Import hook that enforces the allow-list import policy.
 
         Example:
             ```python
             module = _safe_import("math")
             ```
         """
-        if name == "importlib" or name.startswith("importlib."):
+        root = name.partition(".")[0]
+        if root == "importlib":
             raise ImportError("Import 'importlib' is blocked by policy")
+        if root not in allowed:
+            raise ImportError(f"Import '{name}' is not allowed by policy")
+        return __import__(name, globals, locals, fromlist, level)
+
+    return _safe_import
+
+
+def _safe_import_factory_restrict(blocked: frozenset[str]) -> Callable[..., Any]:
+    """Create an import hook that rejects block-listed root packages.
+
+    Example:
+        ```python
+        safe_import = _safe_import_factory_restrict(frozenset({"os"}))
+        ```
+    """
+
+    def _safe_import(
+        name: str,
+        globals: dict[str, Any] | None = None,
+        locals: dict[str, Any] | None = None,
+        fromlist: Any = (),
+        level: int = 0,
+    ) -> Any:
+        """Import hook that enforces the block-list import policy.
 
-        root = name.split(".")[0]
-        if mode == "allow":
-            if root not in allowed_imports:
-                raise ImportError(f"Import '{name}' is not allowed by policy")
-        elif root in blocked_imports:
+        Example:
+            ```python
+            module = _safe_import("math")
+            ```
+        """
+        root = name.partition(".")[0]
+        if root == "importlib":
+            raise ImportError("Import 'importlib' is blocked by policy")
+        if root in blocked:
             raise ImportError(f"Import '{name}' is blocked by policy")
         return __import__(name, globals, locals, fromlist, level)
 
@@ -143,14 +312,12 @@ def _build_safe_builtins(
     else:
         builtins_obj = vars(raw_builtins)
 
-    safe = {}
-    for name, value in builtins_obj.items():
-        if mode == "allow":
-            if name not in allowed_builtins:
-                continue
-        elif name in blocked_builtins:
-            continue
-        safe[name] = value
+    if mode == "allow":
+        keep = frozenset(allowed_builtins)
+        safe = {name: value for name, value in builtins_obj.items() if name in keep}
+    else:
+        drop = frozenset(blocked_builtins)
+        safe = {name: value for name, value in builtins_obj.items() if name not in drop}
 
     safe["__import__"] = safe_import
     # Also block critical functions if not explicitly blocked but commonly dangerous
@@ -158,6 +325,28 @@ def _build_safe_builtins(
     return safe
 
 
+@lru_cache(maxsize=32)
+def _policy_builtins(
+    mode: str,
+    allowed_imports: frozenset[str],
+    blocked_imports: frozenset[str],
+    allowed_builtins: frozenset[str],
+    blocked_builtins: frozenset[str],
+) -> dict[str, Any]:
+    """Return the sanitized builtins for a policy, built once per policy.
+
+    The dict is shared between calls. That is safe because each run executes
+    in its own process: a forked child or a one-shot worker.
+
+    Example:
+        ```python
+        builtins_map = _policy_builtins("restrict", frozenset(), frozenset({"os"}), frozenset(), frozenset({"eval"}))
+        ```
+    """
+    safe_import = _safe_import_factory_mode(mode, set(allowed_imports), set(blocked_imports))
+    return _build_safe_builtins(mode, set(allowed_builtins), set(blocked_builtins), safe_import)
+
+
 def _normalize_system_exit(exit_code: Any) -> tuple[bool, int, str | None]:
     """Normalize `SystemExit` payload into runner status fields.
 
@@ -186,28 +375,20 @@ def _filter_extra_globals(
         filtered = _filter_extra_globals({"x": 1}, "restrict", set(), set())
         ```
     """
-    filtered: dict[str, Any] = {}
-    for key, value in extra_globals.items():
-        key_str = str(key)
-        if mode == "allow" and key_str not in allowed_globals:
-            continue
-        if mode == "restrict" and key_str in blocked_globals:
-            continue
-        filtered[key_str] = value
-    return filtered
+    # Keys arrive from JSON, so they are already strings.
+    if mode == "allow":
+        return {k: v for k, v in extra_globals.items() if k in allowed_globals}
+    return {k: v for k, v in extra_globals.items() if k not in blocked_globals}
 
 
-def main() -> int:
-    """Worker entrypoint: execute user code and print JSON response to stdout.
+def _run_request(req: dict[str, Any]) -> int:
+    """Execute one request payload and print its JSON response to stdout.
 
     Example:
         ```python
-        # Called by runner subprocess:
-        # python -m safe_py_runner.worker < payload.json
-        code = main()
+        exit_code = _run_request({"code": "result = 1 + 1"})
         ```
     """
-    req = json.loads(sys.stdin.read() or "{}")
     code: str = req.get("code", "")
     input_data = req.get("input_data")
     policy = req.get("policy", {})
@@ -224,14 +405,17 @@ def main() -> int:
     extra_globals = policy.get("extra_globals", {}) or {}
 
     try:
-        if mode not in {"allow", "restrict"}:
+        if mode not in VALID_MODES:
             raise ValueError("mode must be 'allow' or 'restrict'")
 
         _set_limits(memory_limit_mb=memory_limit_mb)
 
-        safe_import = _safe_import_factory_mode(mode, allowed_imports, blocked_imports)
-        safe_builtins = _build_safe_builtins(
-            mode, allowed_builtins, blocked_builtins, safe_import
+        safe_builtins = _policy_builtins(
+            mode,
+            frozenset(allowed_imports),
+            frozenset(blocked_imports),
+            frozenset(allowed_builtins),
+            frozenset(blocked_builtins),
         )
 
         # Pre-compile to catch SyntaxError before exec
@@ -239,18 +423,16 @@ def main() -> int:
             byte_code = compile(code, "<user_code>", "exec")
         except SyntaxError as e:
             # Format SyntaxError explicitly
-            sys.stdout.write(
-                json.dumps(
-                    {
-                        "ok": False,
-                        "result": None,
-                        "stdout": "",
-                        "stderr": "",
-                        "timed_out": False,
-                        "resource_exceeded": False,
-                        "error": f"SyntaxError: {e}",
-                    }
-                )
+            _emit(
+                {
+                    "ok": False,
+                    "result": None,
+                    "stdout": "",
+                    "stderr": "",
+                    "timed_out": False,
+                    "resource_exceeded": False,
+                    "error": f"SyntaxError: {e}",
+                }
             )
             return 1
 
@@ -264,16 +446,18 @@ def main() -> int:
         )
         _inject_input_keys(exec_globals, input_data, mode, allowed_globals, blocked_globals)
 
-        stdout_buffer = io.StringIO()
-        stderr_buffer = io.StringIO()
+        max_output_bytes = max_output_kb * 1024
+        stdout_buffer = _BoundedStringIO(max_output_bytes)
+        stderr_buffer = _BoundedStringIO(max_output_bytes)
 
         system_exit: SystemExit | None = None
+        saved_stdout, saved_stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = stdout_buffer, stderr_buffer
         try:
-            with (
-                contextlib.redirect_stdout(stdout_buffer),
-                contextlib.redirect_stderr(stderr_buffer),
-            ):
+            try:
                 exec(byte_code, exec_globals, exec_globals)
+            finally:
+                sys.stdout, sys.stderr = saved_stdout, saved_stderr
         except SystemExit as exc:
             # Preserve Python semantics: non-zero/str exits are failures.
             system_exit = exc
@@ -285,24 +469,23 @@ def main() -> int:
             stderr_buffer.write(traceback.format_exc())
 
             # We set error to this message
-            sys.stdout.write(
-                json.dumps(
-                    {
-                        "ok": False,
-                        "result": None,
-                        "stdout": stdout_buffer.getvalue()[: max_output_kb * 1024],
-                        "stderr": stderr_buffer.getvalue()[: max_output_kb * 1024],
-                        "timed_out": False,
-                        "resource_exceeded": False,
-                        "error": error_msg,
-                    },
-                    default=str,
-                )
+            _emit(
+                {
+                    "ok": False,
+                    "result": None,
+                    "stdout": stdout_buffer.getvalue(),
+                    "stderr": stderr_buffer.getvalue(),
+                    "timed_out": False,
+                    "resource_exceeded": False,
+                    "error": error_msg,
+                }
             )
             return 1
 
-        max_output_bytes = max_output_kb * 1024
-        printed_text = str(exec_globals.get("printed", ""))
+        # The buffer slices `printed` to the space left, so it is never
+        # concatenated with captured output; skip it when nothing would fit.
+        if stdout_buffer.remaining and "printed" in exec_globals:
+            stdout_buffer.write(str(exec_globals["printed"]))
         ok = True
         worker_exit_code = 0
         error: str | None = None
@@ -312,8 +495,8 @@ def main() -> int:
             if isinstance(system_exit.code, str):
                 stderr_buffer.write(f"{system_exit.code}\n")
 
-        stdout_text = (stdout_buffer.getvalue() + printed_text)[:max_output_bytes]
-        stderr_text = stderr_buffer.getvalue()[:max_output_bytes]
+        stdout_text = stdout_buffer.getvalue()
+        stderr_text = stderr_buffer.getvalue()
 
         resp = {
             "ok": ok,
@@ -324,41 +507,252 @@ def main() -> int:
             "resource_exceeded": False,
             "error": error,
         }
-        sys.stdout.write(json.dumps(resp, default=str))
+        _emit(resp)
         return worker_exit_code
 
     except MemoryError:
-        sys.stdout.write(
-            json.dumps(
-                {
-                    "ok": False,
-                    "result": None,
-                    "stdout": "",
-                    "stderr": "",
-                    "timed_out": False,
-                    "resource_exceeded": True,
-                    "error": "Memory limit exceeded",
-                }
-            )
+        _emit(
+            {
+                "ok": False,
+                "result": None,
+                "stdout": "",
+                "stderr": "",
+                "timed_out": False,
+                "resource_exceeded": True,
+                "error": "Memory limit exceeded",
+            }
         )
         return 2
     except Exception as e:
         # Fallback for unexpected runner errors (e.g. init failures)
-        sys.stdout.write(
-            json.dumps(
-                {
-                    "ok": False,
-                    "result": None,
-                    "stdout": "",
-                    "stderr": "",
-                    "timed_out": False,
-                    "resource_exceeded": False,
-                    "error": str(e),
-                }
-            )
+        _emit(
+            {
+                "ok": False,
+                "result": None,
+                "stdout": "",
+                "stderr": "",
+                "timed_out": False,
+                "resource_exceeded": False,
+                "error": str(e),
+            }
         )
         return 1
 
 
+def _read_until_exit(
+    pid: int, out_fd: int, err_fd: int, deadline: float, stderr_limit: int
+) -> tuple[bytes, bytes, int | None]:
+    """Collect a forked child's stdout/stderr and exit code before a deadline.
+
+    Stderr beyond `stderr_limit` bytes is drained and dropped. Returns `None`
+    as the exit code when the deadline passed and the child was killed.
+
+    Example:
+        ```python
+        out, err, exit_code = _read_until_exit(pid, out_fd, err_fd, time.monotonic() + 5, 131072)
+        ```
+    """
+    chunks: dict[int, list[bytes]] = {out_fd: [], err_fd: []}
+    err_size = 0
+    with selectors.DefaultSelector() as selector:
+        selector.register(out_fd, selectors.EVENT_READ)
+        selector.register(err_fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                return b"", b"", None
+            for key, _ in selector.select(timeout=remaining):
+                data = os.read(key.fd, 65536)
+                if not data:
+                    selector.unregister(key.fd)
+                elif key.fd == out_fd:
+                    chunks[out_fd].append(data)
+                elif err_size < stderr_limit:
+                    kept = data[: stderr_limit - err_size]
+                    chunks[err_fd].append(kept)
+                    err_size += len(kept)
+    _, status = os.waitpid(pid, 0)
+    return b"".join(chunks[out_fd]), b"".join(chunks[err_fd]), os.waitstatus_to_exitcode(status)
+
+
+def _run_forked(
+    req: dict[str, Any],
+    timeout_seconds: float,
+    forget: Callable[[], None] | None = None,
+) -> dict[str, Any]:
+    """Run one request in a forked child so no state survives between runs.
+
+    `forget` runs in the child before user code, to drop server-held data
+    (other batch items, earlier replies) the child inherited but must not see.
+
+    Example:
+        ```python
+        frame = _run_forked({"code": "result = 1"}, timeout_seconds=5)
+        ```
+    """
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            os.close(out_r)
+            os.close(err_r)
+            # User code must not read the request stream meant for the server.
+            os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+            os.dup2(out_w, 1)
+            os.dup2(err_w, 2)
+            if forget is not None:
+                forget()
+            exit_code = _run_request(req)
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(exit_code)
+    os.close(out_w)
+    os.close(err_w)
+    try:
+        max_output_kb = int(req.get("policy", {}).get("max_output_kb", 128))
+        out, err, child_exit = _read_until_exit(
+            pid, out_r, err_r, time.monotonic() + timeout_seconds, max_output_kb * 1024
+        )
+    finally:
+        os.close(out_r)
+        os.close(err_r)
+    if child_exit is None:
+        return {"stdout": "", "stderr": "", "returncode": 124, "timed_out": True}
+    return {
+        "stdout": out.decode("utf-8", "replace"),
+        "stderr": err.decode("utf-8", "replace"),
+        "returncode": child_exit,
+        "timed_out": False,
+    }
+
+
+def _warm_caches(payload: dict[str, Any]) -> None:
+    """Fill the policy builtins cache so a forked child inherits it.
+
+    User code is deliberately not compiled here: anything cached in the
+    server is visible to every later child. A malformed policy is skipped;
+    the child rebuilds the builtins itself and reports the error.
+
+    Example:
+        ```python
+        _warm_caches({"code": "result = 1", "policy": {"mode": "restrict"}})
+        ```
+    """
+    policy = payload.get("policy") or {}
+    if not isinstance(policy, dict):
+        return
+    mode = str(policy.get("mode", "restrict"))
+    if mode not in VALID_MODES:
+        return
+    try:
+        _policy_builtins(
+            mode,
+            frozenset(policy.get("allowed_imports", [])),
+            frozenset(policy.get("blocked_imports", [])),
+            frozenset(policy.get("allowed_builtins", [])),
+            frozenset(policy.get("blocked_builtins", [])),
+        )
+    except TypeError:
+        # Non-iterable or unhashable list entries.
+        return
+
+
+def _serve_frame(
+    frame: dict[str, Any], forget: Callable[[], None] | None = None
+) -> dict[str, Any]:
+    """Run one served request frame in a forked child.
+
+    A frame with `reuse_policy` runs under the policy of the previous frame.
+    `forget` is passed through to `_run_forked`.
+
+    Example:
+        ```python
+        reply = _serve_frame({"payload": {"code": "result = 1"}, "timeout_seconds": 5})
+        ```
+    """
+    global _served_policy
+    payload = frame.get("payload") or {}
+    if frame.get("reuse_policy"):
+        payload = {**payload, "policy": _served_policy}
+    else:
+        _served_policy = payload.get("policy")
+    _warm_caches(payload)
+    return _run_forked(
+        payload,
+        timeout_seconds=max(1.0, float(frame.get("timeout_seconds", 5))),
+        forget=forget,
+    )
+
+
+def serve() -> int:
+    """Serve newline-delimited requests, forking a fresh child for each one.
+
+    Each input line is `{"payload": {...}, "timeout_seconds": N}`, optionally
+    with `"reuse_policy": true` in place of `payload["policy"]`, and each
+    output line carries the child's stdout, stderr, returncode, and whether it
+    timed out. A `{"batch": [frame, ...]}` line runs every frame in order and
+    answers with one `{"results": [...]}` line. The server exits when stdin
+    closes.
+
+    Example:
+        ```python
+        # python safe_py_runner/worker.py --serve
+        code = serve()
+        ```
+    """
+    out = sys.stdout.buffer
+    # Frames of the current line still to run, and replies already collected.
+    # Every forked child inherits both, so each child empties its copies
+    # before running user code; nothing else here may hold request data.
+    pending: list[dict[str, Any]] = []
+    replies: list[dict[str, Any]] = []
+
+    def _forget() -> None:
+        """Drop the inherited frames and replies; runs in the forked child.
+
+        Example:
+            ```python
+            _forget()
+            ```
+        """
+        pending.clear()
+        replies.clear()
+
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        frame = _loads(line)
+        del line
+        batch = "batch" in frame
+        pending.extend(frame["batch"] if batch else [frame])
+        del frame
+        while pending:
+            replies.append(_serve_frame(pending.pop(0), _forget))
+        out.write(_dumps({"results": replies} if batch else replies[0]) + b"\n")
+        out.flush()
+        replies.clear()
+    return 0
+
+
+def main() -> int:
+    """Worker entrypoint: execute user code and print JSON response to stdout.
+
+    Example:
+        ```python
+        # Called by runner subprocess:
+        # python -m safe_py_runner.worker < payload.json
+        code = main()
+        ```
+    """
+    if sys.argv[1:] == ["--serve"]:
+        return serve()
+    return _run_request(_loads(sys.stdin.buffer.read() or b"{}"))
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,45 +1,153 @@
 from __future__ import annotations
 
 import argparse
-from functools import partial
+import sys
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import fields, is_dataclass
-from typing import Any, Never, Sequence
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar, Never
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.pretty import Pretty
-from rich.table import Table
-from rich_argparse import RawTextRichHelpFormatter
-from safe_py_runner import DockerEngine
+if TYPE_CHECKING:
+    from rich.console import Console
 
-_CONSOLE = Console(no_color=False)
+    from safe_py_runner import DockerEngine as _DockerEngine
+    from safe_py_runner.execution.config import ContainerInfo, ImageInfo
 
+# Rich and the execution stack are imported on first use so parser-only
+# paths stay cheap to start.
 
-class _CLIHelpFormatter(RawTextRichHelpFormatter):
-    """Rich formatter with explicit high-contrast CLI styles.
+# Engine class used by build_engine(); None means import DockerEngine lazily.
+DockerEngine: type[_DockerEngine] | None = None
+
+# Upper bound on concurrent `docker stop` calls issued by `stop all`.
+STOP_ALL_MAX_WORKERS = 16
+
+# Help text shared by the cached parsers.
+_DESCRIPTION = (
+    "safe-py-runner CLI\n"
+    "Manage only safe-py-runner-managed Docker resources.\n"
+    "This CLI never modifies non-managed containers or images."
+)
+_EPILOG = (
+    "Quick Examples:\n"
+    "  python -m spr list containers\n"
+    "  python -m spr list images\n"
+    "  python -m spr container <id-or-name>\n"
+    "  python -m spr stop container <id>\n"
+    "  python -m spr kill container <id>\n"
+    "  python -m spr cleanup\n\n"
+    "Remote Examples:\n"
+    "  python -m spr --docker-context my-remote-context list containers\n"
+    "  python -m spr --docker-host ssh://ubuntu@server list containers\n"
+    "  python -m spr --ssh-host server --ssh-user ubuntu --ssh-port 22 list containers"
+)
+_LIST_DESCRIPTION = (
+    "List resources created and labeled by safe-py-runner.\n"
+    "Use this command to inspect pool state and cached images."
+)
+_LIST_CONTAINERS_DESCRIPTION = (
+    "Show managed containers in running and exited states.\n"
+    "Includes id, name, image, state, and status."
+)
+_LIST_IMAGES_DESCRIPTION = (
+    "Show managed image cache entries.\n"
+    "Includes repository, tag, age, and size."
+)
+_CONTAINER_DESCRIPTION = (
+    "Show details for one managed container.\n"
+    "Accepts exact name or id prefix."
+)
+_CONTAINER_EPILOG = (
+    "Examples:\n"
+    "  python -m spr container 8a91e1c\n"
+    "  python -m spr container safe-py-runner-2"
+)
+_STOP_DESCRIPTION = (
+    "Stop commands operate only on managed containers.\n"
+    "Use `spr stop container <id>` for a graceful stop."
+)
+_STOP_EPILOG = (
+    "Examples:\n"
+    "  python -m spr stop container abc123\n"
+    "  python -m spr stop container abc123 --timeout-seconds 10\n"
+    "  python -m spr stop all --timeout-seconds 10"
+)
+_KILL_DESCRIPTION = (
+    "Kill commands operate only on managed containers.\n"
+    "Use `spr kill container <id>` for immediate termination."
+)
+_KILL_EPILOG = (
+    "Examples:\n"
+    "  python -m spr kill container abc123"
+)
+_CLEANUP_DESCRIPTION = (
+    "Remove stale managed resources.\n"
+    "Deletes exited managed containers and removable managed images."
+)
+_CLEANUP_EPILOG = (
+    "Example:\n"
+    "  python -m spr cleanup"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_console() -> Console:
+    """Return the shared Rich console, creating it on first use.
 
     Example:
         ```python
-        parser = argparse.ArgumentParser(formatter_class=_CLIHelpFormatter)
+        _get_console().print("hello")
         ```
     """
+    from rich.console import Console
 
-    styles = {
-        "argparse.args": "bold cyan",
-        "argparse.groups": "bold magenta",
-        "argparse.help": "white",
-        "argparse.metavar": "bold yellow",
-        "argparse.prog": "bold bright_blue",
-        "argparse.syntax": "bold bright_white",
-        "argparse.text": "bright_white",
-    }
-
-
-_HELP_FORMATTER = partial(
-    _CLIHelpFormatter,
-    max_help_position=34,
-    width=120,
-)
+    return Console(no_color=False)
+
+
+@lru_cache(maxsize=1)
+def _help_formatter() -> type[argparse.HelpFormatter]:
+    """Return the Rich help formatter class used by every CLI parser.
+
+    Example:
+        ```python
+        parser = argparse.ArgumentParser(formatter_class=_help_formatter())
+        ```
+    """
+    from rich.style import Style
+    from rich_argparse import RawTextRichHelpFormatter
+
+    class _CLIHelpFormatter(RawTextRichHelpFormatter):
+        """Rich formatter with explicit high-contrast CLI styles and layout.
+
+        Example:
+            ```python
+            parser = argparse.ArgumentParser(formatter_class=_CLIHelpFormatter)
+            ```
+        """
+
+        styles: ClassVar[dict[str, str | Style]] = {
+            "argparse.args": "bold cyan",
+            "argparse.groups": "bold magenta",
+            "argparse.help": "white",
+            "argparse.metavar": "bold yellow",
+            "argparse.prog": "bold bright_blue",
+            "argparse.syntax": "bold bright_white",
+            "argparse.text": "bright_white",
+        }
+
+        def __init__(self, prog: str, **kwargs: Any) -> None:
+            """Initialize with the CLI's fixed help width and column.
+
+            Example:
+                ```python
+                formatter = _CLIHelpFormatter("python -m spr")
+                ```
+            """
+            kwargs.setdefault("max_help_position", 34)
+            kwargs.setdefault("width", 120)
+            super().__init__(prog, **kwargs)
+
+    return _CLIHelpFormatter
 
 
 class _RichArgumentParser(argparse.ArgumentParser):
@@ -51,6 +159,36 @@ class _RichArgumentParser(argparse.ArgumentParser):
         ```
     """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the parser with an empty rendered-help cache.
+
+        Example:
+            ```python
+            parser = _RichArgumentParser(prog="python -m spr")
+            ```
+        """
+        super().__init__(*args, **kwargs)
+        self._help_cache: dict[tuple[Any, ...], str] = {}
+        # Set on top-level parsers built with only some subcommands.
+        self._partial = False
+
+    def format_help(self) -> str:
+        """Render help once per console mode and reuse it afterwards.
+
+        Example:
+            ```python
+            text = parser.format_help()
+            ```
+        """
+        # Rich picks colors from the terminal at render time, so the cached
+        # text is keyed on the mode a fresh formatter console would use.
+        console = getattr(self._get_formatter(), "console", None)
+        key = (console.color_system, console.is_terminal) if console is not None else ()
+        text = self._help_cache.get(key)
+        if text is None:
+            text = self._help_cache[key] = super().format_help()
+        return text
+
     def error(self, message: str) -> Never:
         """Render parse errors with Rich and exit.
 
@@ -59,7 +197,13 @@ class _RichArgumentParser(argparse.ArgumentParser):
             # parser.error("invalid usage")
             ```
         """
-        _CONSOLE.print(Panel.fit(f"[bold red]Error:[/bold red] {message}", border_style="red"))
+        if self._partial:
+            # Usage and help must list every command, not just the one parsed.
+            _build_parser(tuple(_SUBCOMMANDS)).error(message)
+
+        from rich.panel import Panel
+
+        _get_console().print(Panel.fit(f"[bold red]Error:[/bold red] {message}", border_style="red"))
         self.print_help()
         raise SystemExit(2)
 
@@ -99,86 +243,20 @@ def _to_jsonable(value: object) -> Any:
     return value
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Build CLI parser for safe-py-runner container operations.
+def _build_list(sub: Any) -> None:
+    """Register the `list` command and its resource subcommands.
 
     Example:
         ```python
-        parser = build_parser()
+        _build_list(parser.add_subparsers(dest="command"))
         ```
     """
-    parser = _RichArgumentParser(
-        prog="python -m spr",
-        description=(
-            "safe-py-runner CLI\n"
-            "Manage only safe-py-runner-managed Docker resources.\n"
-            "This CLI never modifies non-managed containers or images."
-        ),
-        epilog=(
-            "Quick Examples:\n"
-            "  python -m spr list containers\n"
-            "  python -m spr list images\n"
-            "  python -m spr container <id-or-name>\n"
-            "  python -m spr stop container <id>\n"
-            "  python -m spr kill container <id>\n"
-            "  python -m spr cleanup\n\n"
-            "Remote Examples:\n"
-            "  python -m spr --docker-context my-remote-context list containers\n"
-            "  python -m spr --docker-host ssh://ubuntu@server list containers\n"
-            "  python -m spr --ssh-host server --ssh-user ubuntu --ssh-port 22 list containers"
-        ),
-        formatter_class=_HELP_FORMATTER,
-    )
-    parser.add_argument(
-        "--docker-context",
-        help=(
-            "Use an existing Docker context name.\n"
-            "Example: --docker-context prod-us-east\n"
-            "Mutually exclusive with --docker-host and --ssh-host."
-        ),
-    )
-    parser.add_argument(
-        "--docker-host",
-        help=(
-            "Connect directly with DOCKER_HOST.\n"
-            "Examples: ssh://user@server, tcp://host:2376"
-        ),
-    )
-    parser.add_argument(
-        "--ssh-host",
-        help=(
-            "SSH shortcut for remote Docker.\n"
-            "Builds DOCKER_HOST=ssh://<user>@<host> from SSH options."
-        ),
-    )
-    parser.add_argument(
-        "--ssh-user",
-        help="SSH username used with --ssh-host (default: current OS user).",
-    )
-    parser.add_argument(
-        "--ssh-port",
-        type=int,
-        help="SSH port used with --ssh-host (default: 22).",
-    )
-    parser.add_argument(
-        "--ssh-key-path",
-        help="Path to SSH private key file used with --ssh-host.",
-    )
-
-    sub = parser.add_subparsers(
-        dest="command",
-        required=True,
-        parser_class=_RichArgumentParser,
-    )
-
+    help_formatter = _help_formatter()
     list_cmd = sub.add_parser(
         "list",
         help="List managed containers or images.",
-        description=(
-            "List resources created and labeled by safe-py-runner.\n"
-            "Use this command to inspect pool state and cached images."
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_LIST_DESCRIPTION,
+        formatter_class=help_formatter,
     )
     list_cmd_sub = list_cmd.add_subparsers(
         dest="resource",
@@ -188,52 +266,50 @@ def build_parser() -> argparse.ArgumentParser:
     list_cmd_sub.add_parser(
         "containers",
         help="List managed containers.",
-        description=(
-            "Show managed containers in running and exited states.\n"
-            "Includes id, name, image, state, and status."
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_LIST_CONTAINERS_DESCRIPTION,
+        formatter_class=help_formatter,
     )
     list_cmd_sub.add_parser(
         "images",
         help="List managed images.",
-        description=(
-            "Show managed image cache entries.\n"
-            "Includes repository, tag, age, and size."
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_LIST_IMAGES_DESCRIPTION,
+        formatter_class=help_formatter,
     )
 
+
+def _build_container(sub: Any) -> None:
+    """Register the `container` lookup command.
+
+    Example:
+        ```python
+        _build_container(parser.add_subparsers(dest="command"))
+        ```
+    """
     container_cmd = sub.add_parser(
         "container",
         help="Show one managed container by id prefix or exact name.",
-        description=(
-            "Show details for one managed container.\n"
-            "Accepts exact name or id prefix."
-        ),
-        epilog=(
-            "Examples:\n"
-            "  python -m spr container 8a91e1c\n"
-            "  python -m spr container safe-py-runner-2"
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_CONTAINER_DESCRIPTION,
+        epilog=_CONTAINER_EPILOG,
+        formatter_class=_help_formatter(),
     )
     container_cmd.add_argument("container_id")
 
+
+def _build_stop(sub: Any) -> None:
+    """Register the `stop` command and its resource subcommands.
+
+    Example:
+        ```python
+        _build_stop(parser.add_subparsers(dest="command"))
+        ```
+    """
+    help_formatter = _help_formatter()
     stop_cmd = sub.add_parser(
         "stop",
         help="Gracefully stop managed container resources.",
-        description=(
-            "Stop commands operate only on managed containers.\n"
-            "Use `spr stop container <id>` for a graceful stop."
-        ),
-        epilog=(
-            "Examples:\n"
-            "  python -m spr stop container abc123\n"
-            "  python -m spr stop container abc123 --timeout-seconds 10\n"
-            "  python -m spr stop all --timeout-seconds 10"
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_STOP_DESCRIPTION,
+        epilog=_STOP_EPILOG,
+        formatter_class=help_formatter,
     )
     stop_cmd_sub = stop_cmd.add_subparsers(
         dest="resource",
@@ -244,7 +320,7 @@ def build_parser() -> argparse.ArgumentParser:
         "container",
         help="Gracefully stop one managed container by id.",
         description="Gracefully stop a managed container and allow clean shutdown.",
-        formatter_class=_HELP_FORMATTER,
+        formatter_class=help_formatter,
     )
     stop_container.add_argument("container_id")
     stop_container.add_argument(
@@ -257,7 +333,7 @@ def build_parser() -> argparse.ArgumentParser:
         "all",
         help="Gracefully stop all running managed containers.",
         description="Gracefully stop all currently running managed containers.",
-        formatter_class=_HELP_FORMATTER,
+        formatter_class=help_formatter,
     )
     stop_all.add_argument(
         "--timeout-seconds",
@@ -266,18 +342,22 @@ def build_parser() -> argparse.ArgumentParser:
         help="Grace period before force kill by Docker (default: 10).",
     )
 
+
+def _build_kill(sub: Any) -> None:
+    """Register the `kill` command and its resource subcommands.
+
+    Example:
+        ```python
+        _build_kill(parser.add_subparsers(dest="command"))
+        ```
+    """
+    help_formatter = _help_formatter()
     kill_cmd = sub.add_parser(
         "kill",
         help="Force kill managed container resources.",
-        description=(
-            "Kill commands operate only on managed containers.\n"
-            "Use `spr kill container <id>` for immediate termination."
-        ),
-        epilog=(
-            "Examples:\n"
-            "  python -m spr kill container abc123"
-        ),
-        formatter_class=_HELP_FORMATTER,
+        description=_KILL_DESCRIPTION,
+        epilog=_KILL_EPILOG,
+        formatter_class=help_formatter,
     )
     kill_cmd_sub = kill_cmd.add_subparsers(
         dest="resource",
@@ -288,28 +368,155 @@ def build_parser() -> argparse.ArgumentParser:
         "container",
         help="Force kill one managed container by id.",
         description="Force kill a managed container immediately.",
-        formatter_class=_HELP_FORMATTER,
+        formatter_class=help_formatter,
     )
     kill_container.add_argument("container_id")
 
+
+def _build_cleanup(sub: Any) -> None:
+    """Register the `cleanup` command.
+
+    Example:
+        ```python
+        _build_cleanup(parser.add_subparsers(dest="command"))
+        ```
+    """
     sub.add_parser(
         "cleanup",
         help="Remove stale managed resources.",
-        description=(
-            "Remove stale managed resources.\n"
-            "Deletes exited managed containers and removable managed images."
+        description=_CLEANUP_DESCRIPTION,
+        epilog=_CLEANUP_EPILOG,
+        formatter_class=_help_formatter(),
+    )
+
+
+# Subcommand builders in help order; main() builds only the one it needs.
+_SUBCOMMANDS: dict[str, Callable[[Any], None]] = {
+    "list": _build_list,
+    "container": _build_container,
+    "stop": _build_stop,
+    "kill": _build_kill,
+    "cleanup": _build_cleanup,
+}
+# Global options that consume the following argv token as their value.
+_GLOBAL_VALUE_OPTIONS = (
+    "--docker-context",
+    "--docker-host",
+    "--ssh-host",
+    "--ssh-user",
+    "--ssh-port",
+    "--ssh-key-path",
+)
+
+
+def _requested_commands(argv: Sequence[str]) -> tuple[str, ...]:
+    """Return the subcommands a parser needs to parse `argv`.
+
+    Global options are skipped to find the first positional. Help requests
+    before it, missing commands, and unknown commands need every builder so
+    help and error output still list all choices.
+
+    Example:
+        ```python
+        assert _requested_commands(["--ssh-host", "box", "cleanup"]) == ("cleanup",)
+        ```
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ("-h", "--help"):
+            break
+        if token.startswith("-"):
+            # argparse accepts unambiguous prefixes of long options too.
+            if token != "--" and "=" not in token and any(
+                option.startswith(token) for option in _GLOBAL_VALUE_OPTIONS
+            ):
+                next(tokens, None)
+            continue
+        if token in _SUBCOMMANDS:
+            return (token,)
+        break
+    return tuple(_SUBCOMMANDS)
+
+
+# One entry per single-command parser plus the full parser; parse_args() does
+# not mutate a parser, so main() reuses them across calls in one process.
+@lru_cache(maxsize=len(_SUBCOMMANDS) + 1)
+def _build_parser(commands: tuple[str, ...]) -> argparse.ArgumentParser:
+    """Build the CLI parser with only the given subcommands registered.
+
+    Example:
+        ```python
+        parser = _build_parser(("cleanup",))
+        ```
+    """
+    help_formatter = _help_formatter()
+    parser = _RichArgumentParser(
+        prog="python -m spr",
+        description=_DESCRIPTION,
+        epilog=_EPILOG,
+        formatter_class=help_formatter,
+    )
+    parser.add_argument(
+        "--docker-context",
+        help=(
+            "Use an existing Docker context name.\n"
+            "Example: --docker-context prod-us-east\n"
+            "Mutually exclusive with --docker-host and --ssh-host."
+        ),
+    )
+    parser.add_argument(
+        "--docker-host",
+        help=(
+            "Connect directly with DOCKER_HOST.\n"
+            "Examples: ssh://user@server, tcp://host:2376"
         ),
-        epilog=(
-            "Example:\n"
-            "  python -m spr cleanup"
+    )
+    parser.add_argument(
+        "--ssh-host",
+        help=(
+            "SSH shortcut for remote Docker.\n"
+            "Builds DOCKER_HOST=ssh://<user>@<host> from SSH options."
         ),
-        formatter_class=_HELP_FORMATTER,
+    )
+    parser.add_argument(
+        "--ssh-user",
+        help="SSH username used with --ssh-host (default: current OS user).",
+    )
+    parser.add_argument(
+        "--ssh-port",
+        type=int,
+        help="SSH port used with --ssh-host (default: 22).",
+    )
+    parser.add_argument(
+        "--ssh-key-path",
+        help="Path to SSH private key file used with --ssh-host.",
+    )
+
+    sub = parser.add_subparsers(
+        dest="command",
+        required=True,
+        parser_class=_RichArgumentParser,
     )
 
+    for command in commands:
+        _SUBCOMMANDS[command](sub)
+
+    parser._partial = commands != tuple(_SUBCOMMANDS)
     return parser
 
 
-def build_engine(args: argparse.Namespace) -> DockerEngine:
+def build_parser() -> argparse.ArgumentParser:
+    """Build CLI parser for safe-py-runner container operations.
+
+    Example:
+        ```python
+        parser = build_parser()
+        ```
+    """
+    return _build_parser(tuple(_SUBCOMMANDS))
+
+
+def build_engine(args: argparse.Namespace) -> _DockerEngine:
     """Create a DockerEngine from global CLI connection flags.
 
     Example:
@@ -317,7 +524,12 @@ def build_engine(args: argparse.Namespace) -> DockerEngine:
         engine = build_engine(args)
         ```
     """
-    return DockerEngine(
+    engine_cls = DockerEngine
+    if engine_cls is None:
+        from safe_py_runner import DockerEngine as default_engine_cls
+
+        engine_cls = default_engine_cls
+    return engine_cls(
         docker_context=args.docker_context,
         docker_host=args.docker_host,
         ssh_host=args.ssh_host,
@@ -327,119 +539,260 @@ def build_engine(args: argparse.Namespace) -> DockerEngine:
     )
 
 
-def _print_containers(rows: list[dict[str, Any]]) -> None:
+def _print_containers(containers: Iterable[ContainerInfo]) -> None:
     """Render managed containers in a rich table.
 
     Example:
         ```python
-        _print_containers([{"id": "abc", "name": "safe-py-runner-1"}])
+        _print_containers([ContainerInfo("abc", "safe-py-runner-1", "img:tag", "running", "Up 2m")])
         ```
     """
+    from rich.table import Table
+
     table = Table(title="Managed Containers")
     table.add_column("ID", style="cyan")
     table.add_column("Name", style="magenta")
     table.add_column("Image")
     table.add_column("State")
     table.add_column("Status")
-    for row in rows:
-        table.add_row(row["id"], row["name"], row["image"], row["state"], row["status"])
-    _CONSOLE.print(table)
+    for container in containers:
+        table.add_row(container.id, container.name, container.image, container.state, container.status)
+    _get_console().print(table)
 
 
-def _print_images(rows: list[dict[str, Any]]) -> None:
+def _print_images(images: Iterable[ImageInfo]) -> None:
     """Render managed images in a rich table.
 
     Example:
         ```python
-        _print_images([{"id": "sha", "repository": "safe", "tag": "v1", "created_since": "1m", "size": "100MB"}])
+        _print_images([ImageInfo("sha", "safe", "v1", "1m", "100MB")])
         ```
     """
+    from rich.table import Table
+
     table = Table(title="Managed Images")
     table.add_column("ID", style="cyan")
     table.add_column("Repository", style="magenta")
     table.add_column("Tag")
     table.add_column("Created")
     table.add_column("Size")
-    for row in rows:
+    for image in images:
         table.add_row(
-            row["id"],
-            row["repository"],
-            row["tag"],
-            row["created_since"],
-            row["size"],
+            image.id,
+            image.repository,
+            image.tag,
+            image.created_since,
+            image.size,
         )
-    _CONSOLE.print(table)
+    _get_console().print(table)
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    """Run the `spr` CLI command handler.
+def _field_table(payload: Any) -> Any:
+    """Return a key/value Rich table for a field dict, else a Pretty view.
 
     Example:
         ```python
-        code = main(["list", "containers"])
+        renderable = _field_table({"id": "abc", "name": "safe-py-runner-1"})
         ```
     """
-    parser = build_parser()
-    args = parser.parse_args(list(argv) if argv is not None else None)
-    engine = build_engine(args)
+    if not isinstance(payload, dict):
+        from rich.pretty import Pretty
 
-    if args.command == "list" and args.resource == "containers":
-        rows = [_to_jsonable(c) for c in engine.list_containers(all_states=True)]
-        _print_containers(rows)
-        return 0
-    if args.command == "list" and args.resource == "images":
-        rows = [_to_jsonable(i) for i in engine.list_images()]
-        _print_images(rows)
-        return 0
-    if args.command == "container":
-        needle = args.container_id
-        rows = [_to_jsonable(c) for c in engine.list_containers(all_states=True)]
-        matches = [
-            row
-            for row in rows
-            if isinstance(row, dict)
-            and isinstance(row.get("id"), str)
-            and isinstance(row.get("name"), str)
-            and (row["id"].startswith(needle) or row["name"] == needle)
-        ]
-        if not matches:
-            _CONSOLE.print(Panel.fit(f"No managed container matched '{needle}'", style="bold red"))
-            return 1
-        _CONSOLE.print(Panel.fit(Pretty(matches[0]), title="Container", border_style="cyan"))
-        return 0
-    if args.command == "stop" and args.resource == "container":
-        engine.stop_container(args.container_id, timeout_seconds=args.timeout_seconds)
-        _CONSOLE.print(Panel.fit(f"Stopped container {args.container_id}", style="bold green"))
+        return Pretty(payload)
+    from rich.table import Table
+
+    table = Table(show_header=False, box=None)
+    table.add_column(style="bold cyan")
+    table.add_column()
+    for key, value in payload.items():
+        table.add_row(str(key), str(value))
+    return table
+
+
+def _handle_list_containers(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Print every managed container.
+
+    Example:
+        ```python
+        code = _handle_list_containers(args, engine)
+        ```
+    """
+    _print_containers(engine.list_containers(all_states=True))
+    return 0
+
+
+def _handle_list_images(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Print every managed image.
+
+    Example:
+        ```python
+        code = _handle_list_images(args, engine)
+        ```
+    """
+    _print_images(engine.list_images())
+    return 0
+
+
+def _handle_container(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Show the first managed container matching an id prefix or exact name.
+
+    Example:
+        ```python
+        code = _handle_container(args, engine)
+        ```
+    """
+    from rich.panel import Panel
+
+    needle = args.container_id
+    # Stop at the first hit and convert only that container for display.
+    match = next(
+        (
+            container
+            for container in engine.list_containers(all_states=True)
+            if container.name == needle or container.id.startswith(needle)
+        ),
+        None,
+    )
+    if match is None:
+        _get_console().print(Panel.fit(f"No managed container matched '{needle}'", style="bold red"))
+        return 1
+    _get_console().print(Panel.fit(_field_table(_to_jsonable(match)), title="Container", border_style="cyan"))
+    return 0
+
+
+def _handle_stop_container(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Gracefully stop one managed container.
+
+    Example:
+        ```python
+        code = _handle_stop_container(args, engine)
+        ```
+    """
+    from rich.panel import Panel
+
+    engine.stop_container(args.container_id, timeout_seconds=args.timeout_seconds)
+    _get_console().print(Panel.fit(f"Stopped container {args.container_id}", style="bold green"))
+    return 0
+
+
+def _handle_stop_all(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Gracefully stop every running managed container.
+
+    Example:
+        ```python
+        code = _handle_stop_all(args, engine)
+        ```
+    """
+    from rich.panel import Panel
+
+    console = _get_console()
+    # Without all_states Docker already filters to running containers; the
+    # state check below still drops paused ones.
+    running = [c.id for c in engine.list_containers(all_states=False) if c.state == "running"]
+    if not running:
+        console.print(Panel.fit("No running managed containers to stop.", style="bold yellow"))
         return 0
-    if args.command == "stop" and args.resource == "all":
-        rows = [_to_jsonable(c) for c in engine.list_containers(all_states=True)]
-        running = [
-            row
-            for row in rows
-            if isinstance(row, dict)
-            and isinstance(row.get("id"), str)
-            and row.get("state") == "running"
-        ]
-        if not running:
-            _CONSOLE.print(Panel.fit("No running managed containers to stop.", style="bold yellow"))
-            return 0
-        for row in running:
-            engine.stop_container(row["id"], timeout_seconds=args.timeout_seconds)
-        _CONSOLE.print(
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # Each stop waits on Docker for up to the grace period, so issue them
+    # concurrently instead of paying it once per container.
+    failures: list[str] = []
+    with ThreadPoolExecutor(
+        max_workers=min(len(running), STOP_ALL_MAX_WORKERS),
+        thread_name_prefix="spr-stop",
+    ) as executor:
+        futures = {
+            executor.submit(engine.stop_container, container_id, timeout_seconds=args.timeout_seconds): container_id
+            for container_id in running
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                failures.append(f"{futures[future]}: {error}")
+    stopped = len(running) - len(failures)
+    if failures:
+        console.print(
             Panel.fit(
-                f"Stopped {len(running)} managed container(s) with timeout {args.timeout_seconds}s",
-                style="bold green",
+                f"Stopped {stopped} of {len(running)} managed container(s); failed:\n" + "\n".join(sorted(failures)),
+                style="bold red",
             )
         )
-        return 0
-    if args.command == "kill" and args.resource == "container":
-        engine.kill_container(args.container_id)
-        _CONSOLE.print(Panel.fit(f"Killed container {args.container_id}", style="bold yellow"))
-        return 0
-    if args.command == "cleanup":
-        summary = _to_jsonable(engine.cleanup_stale())
-        _CONSOLE.print(Panel.fit(Pretty(summary), title="Cleanup Summary", border_style="green"))
-        return 0
+        return 1
+    console.print(
+        Panel.fit(
+            f"Stopped {stopped} managed container(s) with timeout {args.timeout_seconds}s",
+            style="bold green",
+        )
+    )
+    return 0
+
+
+def _handle_kill_container(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Force kill one managed container.
+
+    Example:
+        ```python
+        code = _handle_kill_container(args, engine)
+        ```
+    """
+    from rich.panel import Panel
+
+    engine.kill_container(args.container_id)
+    _get_console().print(Panel.fit(f"Killed container {args.container_id}", style="bold yellow"))
+    return 0
 
-    parser.error("Unhandled command")
-    return 2
+
+def _handle_cleanup(args: argparse.Namespace, engine: _DockerEngine) -> int:
+    """Remove stale managed resources and print the summary.
+
+    Example:
+        ```python
+        code = _handle_cleanup(args, engine)
+        ```
+    """
+    from rich.panel import Panel
+
+    summary = engine.cleanup_stale()
+    _get_console().print(
+        Panel.fit(
+            f"Removed {summary.removed_containers} container(s), {summary.removed_images} image(s)",
+            title="Cleanup Summary",
+            border_style="green",
+        )
+    )
+    return 0
+
+
+# Command handlers keyed by (command, resource); resource is None for
+# commands without a resource subcommand.
+_HANDLERS: dict[tuple[str, str | None], Callable[[argparse.Namespace, _DockerEngine], int]] = {
+    ("list", "containers"): _handle_list_containers,
+    ("list", "images"): _handle_list_images,
+    ("container", None): _handle_container,
+    ("stop", "container"): _handle_stop_container,
+    ("stop", "all"): _handle_stop_all,
+    ("kill", "container"): _handle_kill_container,
+    ("cleanup", None): _handle_cleanup,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the `spr` CLI command handler.
+
+    Example:
+        ```python
+        code = main(["list", "containers"])
+        ```
+    """
+    args_list = list(argv) if argv is not None else sys.argv[1:]
+    parser = _build_parser(_requested_commands(args_list))
+    args = parser.parse_args(args_list)
+    engine = build_engine(args)
+    # argv strings are fresh objects; interning them lets the handler lookup
+    # match the (already interned) literal keys by identity.
+    resource = getattr(args, "resource", None)
+    key = (sys.intern(args.command), sys.intern(resource) if resource is not None else None)
+    handler = _HANDLERS.get(key)
+    if handler is None:
+        parser.error("Unhandled command")
+    return handler(args, engine)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Callable, Iterator
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+from safe_py_runner import LocalEngine
+from safe_py_runner import run_code as raw_run_code
+
+TEST_VENV_DIR = "/tmp/safe_py_runner_test_venv"
+# Fixtures that start real worker processes in the shared venv; tests using
+# them are marked `slow` and skipped by the default `pytest` run.
+_WORKER_FIXTURES = frozenset({"engine", "run_code", "test_venv_dir"})
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        if _WORKER_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.slow)
+
+
+@pytest.fixture(scope="session")
+def test_venv_dir() -> str:
+    """Worker venv prepared once per session and shared by every LocalEngine test.
+
+    The directory persists across sessions, so later runs only revalidate it.
+    """
+    LocalEngine(venv_dir=TEST_VENV_DIR, venv_manager="uv").close()
+    return TEST_VENV_DIR
+
+
+@pytest.fixture(scope="session")
+def engine(test_venv_dir: str) -> Iterator[LocalEngine]:
+    """One LocalEngine (and worker venv) shared by every test in the session."""
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    yield engine
+    engine.close()
+
+
+@pytest.fixture(scope="session")
+def run_code(engine: LocalEngine) -> Callable[..., Any]:
+    """`run_code` pre-bound to the shared session engine."""
+    return partial(raw_run_code, engine=engine)
+
+
+@pytest.fixture(scope="session")
+def project_root() -> Path:
+    """Repository root, resolved once per session."""
+    return Path(__file__).resolve().parents[1]
+
+
+def _read_project_file(project_root: Path, *parts: str) -> str:
+    return project_root.joinpath(*parts).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def readme_text(project_root: Path) -> str:
+    return _read_project_file(project_root, "README.md")
+
+
+@pytest.fixture(scope="session")
+def pypi_readme_text(project_root: Path) -> str:
+    return _read_project_file(project_root, "docs", "README_PYPI.md")
+
+
+@pytest.fixture(scope="session")
+def bubblewrap_comparison_text(project_root: Path) -> str:
+    return _read_project_file(project_root, "docs", "BUBBLEWRAP_COMPARISON.md")
+
+
+@pytest.fixture(scope="session")
+def makefile_text(project_root: Path) -> str:
+    return _read_project_file(project_root, "Makefile")
+
+
+@pytest.fixture(scope="session")
+def ci_yml_text(project_root: Path) -> str:
+    return _read_project_file(project_root, ".github", "workflows", "ci.yml")
+
+
+@pytest.fixture(scope="session")
+def source_files(project_root: Path) -> list[Path]:
+    root = project_root / "src" / "safe_py_runner"
+    return sorted(path for path in root.rglob("*.py") if "__pycache__" not in path.parts)
+
+
+def _load_script_module(project_root: Path, name: str) -> ModuleType:
+    script_path = project_root / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load {name} module")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def set_version_module(project_root: Path) -> ModuleType:
+    return _load_script_module(project_root, "set_version")
+
+
+@pytest.fixture(scope="session")
+def release_metadata_module(project_root: Path) -> ModuleType:
+    return _load_script_module(project_root, "read_release_metadata")
+
+
+@pytest.fixture(scope="session")
+def generate_metadata_module(project_root: Path) -> ModuleType:
+    return _load_script_module(project_root, "generate_release_metadata")
@@ -19,8 +19,7 @@ pytestmark = pytest.mark.skipif(not _docker_ready(), reason="Docker integration
 
 
 @pytest.fixture(scope="module")
-def docker_test_image() -> str:
-    root = Path(__file__).resolve().parents[2]
+def docker_test_image(project_root: Path) -> str:
     tag = "safe-py-runner-test:local"
     build = subprocess.run(
         [
@@ -29,8 +28,8 @@ def docker_test_image() -> str:
             "-t",
             tag,
             "-f",
-            str(root / "docker" / "runtime" / "Dockerfile"),
-            str(root),
+            str(project_root / "docker" / "runtime" / "Dockerfile"),
+            str(project_root),
         ],
         capture_output=True,
         text=True,
@@ -8,8 +8,11 @@ def test_engine_required() -> None:
         run_code("result = 2 + 2")  # type: ignore[call-arg]
 
 
-def test_local_engine_executes() -> None:
-    engine = LocalEngine(venv_dir="/tmp/safe_py_runner_test_backend_routing")
-    result = run_code("result = 2 + 2", engine=engine)
+def test_local_engine_executes(test_venv_dir: str) -> None:
+    engine = LocalEngine(venv_dir=test_venv_dir)
+    try:
+        result = run_code("result = 2 + 2", engine=engine)
+    finally:
+        engine.close()
     assert result.ok is True
     assert result.result == 4
@@ -14,3 +14,10 @@ def test_local_and_docker_capabilities_support_policy_controls() -> None:
     assert docker.supports_builtin_blocking
     assert docker.supports_memory_limit
     assert docker.supports_timeout
+
+
+def test_capabilities_lookup_returns_shared_instances() -> None:
+    assert capabilities_for_backend("localengine") is capabilities_for_backend("docker")
+    unknown = capabilities_for_backend("e2b")
+    assert not unknown.supports_timeout
+    assert unknown is capabilities_for_backend("e2b")
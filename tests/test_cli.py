@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import io
+import subprocess
+import sys
+from typing import ClassVar
 
 import pytest
 
@@ -74,9 +77,11 @@ def test_cli_stop_container(capsys: pytest.CaptureFixture[str]) -> None:
 
 def test_cli_stop_all_containers(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
     class _StopAllEngine(_FakeEngine):
-        stopped_ids: list[tuple[str, int]] = []
+        stopped_ids: ClassVar[list[tuple[str, int]]] = []
+        listed_all_states: ClassVar[list[bool]] = []
 
         def list_containers(self, all_states: bool = False):
+            self.__class__.listed_all_states.append(all_states)
             running = _FakeContainer("abc123", "safe-py-runner-1")
             exited = _FakeContainer("def456", "safe-py-runner-2")
             exited.state = "exited"
@@ -87,11 +92,30 @@ def test_cli_stop_all_containers(capsys: pytest.CaptureFixture[str], monkeypatch
 
     monkeypatch.setattr(cli, "DockerEngine", _StopAllEngine)
     _StopAllEngine.stopped_ids = []
+    _StopAllEngine.listed_all_states = []
     code = cli.main(["stop", "all", "--timeout-seconds", "7"])
     output = capsys.readouterr().out
     assert code == 0
     assert "Stopped 1 managed container(s) with timeout 7s" in output
     assert _StopAllEngine.stopped_ids == [("abc123", 7)]
+    assert _StopAllEngine.listed_all_states == [False]
+
+
+def test_cli_stop_all_reports_failed_containers(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    class _PartialStopEngine(_FakeEngine):
+        def list_containers(self, all_states: bool = False):
+            return [_FakeContainer("abc123", "safe-py-runner-1"), _FakeContainer("def456", "safe-py-runner-2")]
+
+        def stop_container(self, container_id: str, timeout_seconds: int = 10) -> None:
+            if container_id == "def456":
+                raise RuntimeError("Failed to stop container: daemon timeout")
+
+    monkeypatch.setattr(cli, "DockerEngine", _PartialStopEngine)
+    code = cli.main(["stop", "all"])
+    output = capsys.readouterr().out
+    assert code == 1
+    assert "Stopped 1 of 2 managed container(s)" in output
+    assert "def456: Failed to stop container: daemon timeout" in output
 
 
 def test_cli_stop_all_no_running_containers(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
@@ -120,6 +144,44 @@ def test_cli_container_not_found(monkeypatch: pytest.MonkeyPatch, capsys: pytest
     assert "No managed container matched" in output
 
 
+def test_cli_container_stops_at_first_match(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    class _ManyContainerEngine(_FakeEngine):
+        def list_containers(self, all_states: bool = False):
+            yield _FakeContainer("abc123", "safe-py-runner-1")
+            yield _FakeContainer("def456", "safe-py-runner-2")
+            raise AssertionError("lookup kept scanning after a match")
+
+    converted: list[object] = []
+    to_jsonable = cli._to_jsonable
+
+    def _counting(value: object):
+        converted.append(value)
+        return to_jsonable(value)
+
+    monkeypatch.setattr(cli, "DockerEngine", _ManyContainerEngine)
+    monkeypatch.setattr(cli, "_to_jsonable", _counting)
+    code = cli.main(["container", "def"])
+    output = capsys.readouterr().out
+    assert code == 0
+    assert "safe-py-runner-2" in output
+    assert len(converted) == 1
+
+
+def test_cli_container_shows_fields(capsys: pytest.CaptureFixture[str]) -> None:
+    code = cli.main(["container", "abc"])
+    output = capsys.readouterr().out
+    assert code == 0
+    assert "safe-py-runner-1" in output
+    assert "Up 10s" in output
+
+
+def test_cli_cleanup_summary(capsys: pytest.CaptureFixture[str]) -> None:
+    code = cli.main(["cleanup"])
+    output = capsys.readouterr().out
+    assert code == 0
+    assert "Removed 1 container(s), 2 image(s)" in output
+
+
 def test_cli_subcommand_help(capsys: pytest.CaptureFixture[str]) -> None:
     with pytest.raises(SystemExit) as exc:
         cli.main(["stop", "--help"])
@@ -147,3 +209,76 @@ def test_cli_print_help_writes_to_requested_stream(capsys: pytest.CaptureFixture
     help_text = buffer.getvalue()
     assert "Usage:" in help_text
     assert "safe-py-runner CLI" in help_text
+
+
+def test_cli_import_defers_rich_and_execution_stack() -> None:
+    probe = (
+        "import sys, spr.cli\n"
+        "print(sorted(m for m in ('rich', 'rich_argparse', 'safe_py_runner') if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["cleanup"], ("cleanup",)),
+        (["--ssh-host", "list", "stop", "all"], ("stop",)),
+        (["--docker-cont", "ctx", "kill", "container", "abc"], ("kill",)),
+        (["--docker-host=tcp://h:2376", "container", "abc"], ("container",)),
+        (["--help", "list"], tuple(cli._SUBCOMMANDS)),
+        (["bogus"], tuple(cli._SUBCOMMANDS)),
+        ([], tuple(cli._SUBCOMMANDS)),
+    ],
+)
+def test_cli_requested_commands_peeks_first_positional(argv: list[str], expected: tuple[str, ...]) -> None:
+    assert cli._requested_commands(argv) == expected
+
+
+def test_cli_main_builds_only_requested_subcommand(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli._build_parser.cache_clear()
+    built: list[str] = []
+    for name, builder in list(cli._SUBCOMMANDS.items()):
+
+        def _recording(sub, name=name, builder=builder) -> None:
+            built.append(name)
+            builder(sub)
+
+        monkeypatch.setitem(cli._SUBCOMMANDS, name, _recording)
+
+    assert cli.main(["kill", "container", "abc123"]) == 0
+    assert built == ["kill"]
+    cli._build_parser.cache_clear()
+
+
+def test_cli_partial_parser_errors_show_every_command(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["cleanup", "--bogus"])
+    assert exc.value.code == 2
+    out = capsys.readouterr().out
+    assert "unrecognized arguments: --bogus" in out
+    assert "{list,container,stop,kill,cleanup}" in out
+
+
+def test_cli_main_reuses_cached_parser() -> None:
+    cli._build_parser.cache_clear()
+    assert cli.main(["kill", "container", "abc123"]) == 0
+    assert cli.main(["kill", "container", "def456"]) == 0
+    info = cli._build_parser.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert cli.build_parser() is cli.build_parser()
+
+
+def test_cli_format_help_is_rendered_once_per_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    parser = cli._build_parser(("cleanup",))
+    parser._help_cache.clear()
+    first = parser.format_help()
+
+    def _fail_render(self) -> str:
+        raise AssertionError("help was rendered again")
+
+    monkeypatch.setattr(cli.argparse.ArgumentParser, "format_help", _fail_render)
+    assert parser.format_help() is first
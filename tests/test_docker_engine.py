@@ -0,0 +1,278 @@
+import pytest
+
+from safe_py_runner import DockerEngine
+from safe_py_runner.execution import docker_engine
+from safe_py_runner.execution.docker_pool import ContainerLease
+from safe_py_runner.execution.types import ExecutionRequest
+
+
+@pytest.fixture(autouse=True)
+def _reset_known_images(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(docker_engine, "_KNOWN_IMAGES", set())
+
+
+def test_docker_probe_is_cached_after_success(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str | None] = []
+
+    def _fake_probe(*, docker_env, docker_context):
+        calls.append(docker_context)
+        return True, None
+
+    monkeypatch.setattr(docker_engine, "docker_is_available", _fake_probe)
+    engine = DockerEngine()
+    assert engine._probe_docker() == (True, None)
+    assert engine._probe_docker() == (True, None)
+    assert len(calls) == 1
+
+
+def test_docker_probe_failure_is_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str | None] = []
+
+    def _fake_probe(*, docker_env, docker_context):
+        calls.append(docker_context)
+        return False, "daemon down"
+
+    monkeypatch.setattr(docker_engine, "docker_is_available", _fake_probe)
+    engine = DockerEngine()
+    assert engine._probe_docker() == (False, "daemon down")
+    assert engine._probe_docker() == (False, "daemon down")
+    assert len(calls) == 2
+
+
+class _Completed:
+    def __init__(self, stdout: str | bytes = "", returncode: int = 0, stderr: str | bytes = "") -> None:
+        self.stdout = stdout
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def test_list_containers_parses_json_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = DockerEngine()
+    row = (
+        '{"ID":"abc","Names":"safe-py-runner-1","Image":"img:tag",'
+        '"State":"running","Status":"Up 2m | healthy"}'
+    )
+    monkeypatch.setattr(engine, "_run_docker", lambda args: _Completed(row + "\n\n"))
+
+    containers = engine.list_containers(all_states=True)
+
+    assert [(c.id, c.name, c.status) for c in containers] == [
+        ("abc", "safe-py-runner-1", "Up 2m | healthy")
+    ]
+
+
+def test_list_images_parses_json_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = DockerEngine()
+    row = (
+        '{"ID":"sha256:1","Repository":"safe-py-runner-env","Tag":"v1",'
+        '"CreatedSince":"1 hour ago","Size":"215MB"}'
+    )
+    monkeypatch.setattr(engine, "_run_docker", lambda args: _Completed(row))
+
+    images = engine.list_images()
+
+    assert [(i.repository, i.tag, i.size) for i in images] == [
+        ("safe-py-runner-env", "v1", "215MB")
+    ]
+
+
+def test_local_socket_skips_docker_info(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    import socket
+
+    sock_path = tmp_path / "docker.sock"
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(str(sock_path))
+    monkeypatch.setattr(docker_engine, "LOCAL_DOCKER_SOCKET", str(sock_path))
+    monkeypatch.setattr(docker_engine.shutil, "which", lambda name: "/usr/bin/docker")
+
+    def _no_subprocess(*args, **kwargs):
+        raise AssertionError("docker info should not run for the local socket")
+
+    monkeypatch.setattr(docker_engine.subprocess, "run", _no_subprocess)
+    local_env = {"DOCKER_CONFIG": str(tmp_path)}
+    try:
+        ok = docker_engine.docker_is_available(docker_env=local_env, docker_context=None)
+        assert ok == (True, None)
+        with pytest.raises(AssertionError):
+            docker_engine.docker_is_available(
+                docker_env={**local_env, "DOCKER_HOST": "ssh://user@host"}, docker_context=None
+            )
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize(
+    ("env", "config", "usable"),
+    [
+        pytest.param({}, '{"currentContext": "default"}', True, id="default-context"),
+        pytest.param({"DOCKER_CONTEXT": "remote"}, None, False, id="env-context"),
+        pytest.param({}, '{"currentContext": "remote"}', False, id="config-context"),
+        pytest.param({}, "not json", False, id="unreadable-config"),
+        pytest.param(
+            {"DOCKER_HOST": "unix:///sock", "DOCKER_CONTEXT": "remote"}, None, True, id="host-wins"
+        ),
+    ],
+)
+def test_local_socket_fast_path_respects_docker_context(
+    env: dict[str, str],
+    config: str | None,
+    usable: bool,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+) -> None:
+    import socket
+
+    sock_path = tmp_path / "docker.sock"
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(str(sock_path))
+    monkeypatch.setattr(docker_engine, "LOCAL_DOCKER_SOCKET", str(sock_path))
+    if config is not None:
+        (tmp_path / "config.json").write_text(config)
+    if "DOCKER_HOST" in env:
+        env = {**env, "DOCKER_HOST": f"unix://{sock_path}"}
+    try:
+        assert docker_engine._local_socket_is_usable({**env, "DOCKER_CONFIG": str(tmp_path)}) is usable
+    finally:
+        server.close()
+
+
+def test_package_image_build_streams_dockerfile_without_context(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = DockerEngine(packages=["packaging==24.1"])
+    calls: list[tuple[list[str], str | None]] = []
+
+    def _fake_run_docker(args, *, input_text=None):
+        calls.append((args, input_text))
+        return _Completed(returncode=1 if args[:2] == ["image", "inspect"] else 0)
+
+    monkeypatch.setattr(engine, "_run_docker", _fake_run_docker)
+    engine._ensure_package_image("safe-py-runner-env:abc")
+
+    build_args, dockerfile = calls[-1]
+    assert build_args == ["build", "-t", "safe-py-runner-env:abc", "-"]
+    assert dockerfile is not None
+    assert "RUN python -m pip install packaging==24.1" in dockerfile
+
+
+def test_image_presence_is_cached_per_target(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    def _fake_run_docker(args, *, input_text=None):
+        calls.append(args)
+        return _Completed()
+
+    local = DockerEngine()
+    remote = DockerEngine(docker_host="tcp://remote:2376")
+    monkeypatch.setattr(local, "_run_docker", _fake_run_docker)
+    monkeypatch.setattr(remote, "_run_docker", _fake_run_docker)
+
+    assert local._ensure_image_available("img:tag")
+    assert local._ensure_image_available("img:tag")
+    assert remote._ensure_image_available("img:tag")
+    assert calls == [["image", "inspect", "img:tag"], ["image", "inspect", "img:tag"]]
+
+    local._forget_image("img:tag")
+    assert local._ensure_image_available("img:tag")
+    assert len(calls) == 3
+
+
+def test_image_presence_is_cached_per_ssh_tunnel(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    def _fake_run_docker(args, *, input_text=None):
+        calls.append(args)
+        return _Completed()
+
+    engines = [
+        DockerEngine(ssh_host="box"),
+        DockerEngine(ssh_host="box", ssh_port=2222),
+        DockerEngine(ssh_host="box", ssh_user="ops"),
+        DockerEngine(ssh_host="box", ssh_user="ops", ssh_port=2222),
+    ]
+    for engine in engines:
+        monkeypatch.setattr(engine, "_run_docker", _fake_run_docker)
+        assert engine._ensure_image_available("img:tag")
+    assert len(calls) == len(engines)
+
+    assert DockerEngine(ssh_host="box", ssh_port=2222)._ensure_image_available("img:tag")
+    assert len(calls) == len(engines)
+
+
+def test_cleanup_stale_removes_stopped_containers_and_images(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = DockerEngine()
+    containers = [
+        docker_engine.ContainerInfo("a1", "safe-py-runner-1", "img", "running", "Up"),
+        docker_engine.ContainerInfo("b2", "safe-py-runner-2", "img", "exited", "Exited"),
+        docker_engine.ContainerInfo("c3", "safe-py-runner-3", "img", "exited", "Exited"),
+    ]
+    images = [
+        docker_engine.ImageInfo("sha256:1", "safe-py-runner-env", "v1", "1h", "1MB"),
+        docker_engine.ImageInfo("sha256:2", "safe-py-runner-env", "v2", "1h", "1MB"),
+    ]
+    calls: list[list[str]] = []
+
+    def _fake_run_docker(args, *, input_text=None):
+        calls.append(args)
+        if args[0] == "rm":
+            return _Completed("b2\nc3\n")
+        return _Completed(
+            "Untagged: safe-py-runner-env:v1\nDeleted: sha256:1\n",
+            returncode=1,
+            stderr="Error: image is in use",
+        )
+
+    monkeypatch.setattr(engine, "list_containers", lambda all_states=False: containers)
+    monkeypatch.setattr(engine, "list_images", lambda: images)
+    monkeypatch.setattr(engine, "_run_docker", _fake_run_docker)
+
+    summary = engine.cleanup_stale()
+
+    assert (summary.removed_containers, summary.removed_images) == (2, 1)
+    assert calls == [
+        ["rm", "-f", "b2", "c3"],
+        ["image", "rm", "safe-py-runner-env:v1", "safe-py-runner-env:v2"],
+    ]
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.released: list[tuple[str, bool]] = []
+
+    def acquire(self, **kwargs) -> ContainerLease:
+        return ContainerLease("safe-py-runner-a1", 0.0, 0.0, 0)
+
+    def ensure_warm(self, **kwargs) -> None:
+        return None
+
+    def release(self, *, container_name: str, mark_bad: bool, **kwargs) -> None:
+        self.released.append((container_name, mark_bad))
+
+
+def test_execute_runs_worker_with_prebuilt_exec_argv(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = _FakePool()
+    monkeypatch.setattr(docker_engine, "GLOBAL_DOCKER_POOL", pool)
+    engine = DockerEngine(docker_context="remote")
+    monkeypatch.setattr(engine, "_probe_docker", lambda: (True, None))
+    monkeypatch.setattr(engine, "_resolve_image", lambda: "img:tag")
+    monkeypatch.setattr(engine, "_run_docker", lambda args: _Completed())
+    commands: list[list[str]] = []
+
+    def _fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return _Completed(stdout=b'{"ok": true}', stderr=b"")
+
+    monkeypatch.setattr(docker_engine.subprocess, "run", _fake_run)
+
+    for _ in range(2):
+        outcome = engine.execute(ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5))
+        assert outcome.stdout == '{"ok": true}'
+
+    workdir = commands[0][6]
+    assert commands[0] == [
+        "docker", "--context", "remote", "exec", "-i", "-w", workdir,
+        "safe-py-runner-a1", "python", "-m", "safe_py_runner.worker",
+    ]
+    assert pool.released == [("safe-py-runner-a1", False)] * 2
@@ -1,7 +1,20 @@
+import hashlib
 import os
+import subprocess
+import sys
+import textwrap
+import threading
 import time
+from typing import Self
 
-from safe_py_runner.execution.config import DockerPoolSettings, default_pool_settings
+import pytest
+
+from safe_py_runner.execution import docker_pool
+from safe_py_runner.execution.config import (
+    DockerPoolSettings,
+    default_pool_settings,
+    env_hash,
+)
 from safe_py_runner.execution.docker_pool import ContainerLease, should_rotate
 
 
@@ -16,14 +29,318 @@ def test_default_acquire_timeout_uses_policy_timeout() -> None:
 
 
 def test_rotation_by_runs_threshold() -> None:
-    now = time.time()
+    now = time.monotonic()
     lease = ContainerLease(container_name="c0", created_at=now, last_used_at=now, run_count=25)
     settings = DockerPoolSettings(pool_size=1, max_runs=25, ttl_seconds=600, acquire_timeout=7)
-    assert should_rotate(lease, settings, now=time.time()) is True
+    assert should_rotate(lease, settings, now=time.monotonic()) is True
 
 
 def test_rotation_by_ttl_threshold() -> None:
-    now = time.time()
+    now = time.monotonic()
     lease = ContainerLease(container_name="c0", created_at=now - 601, last_used_at=now, run_count=1)
     settings = DockerPoolSettings(pool_size=1, max_runs=25, ttl_seconds=600, acquire_timeout=7)
     assert should_rotate(lease, settings, now=now) is True
+
+
+def test_env_hash_matches_joined_material() -> None:
+    packages = ["numpy==1.26.4", "pandas==2.2.2"]
+    for pkgs, namespace in ((packages, "demo"), ([], None)):
+        material = f"3.11|{namespace or ''}|{'|'.join(pkgs)}"
+        expected = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+        assert env_hash(python_version="3.11", packages=pkgs, namespace=namespace) == expected
+
+
+class _Completed:
+    def __init__(self, stdout: str = "", returncode: int = 0) -> None:
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = ""
+
+
+class _FakeDockerCLI:
+    """Record pool Docker CLI calls and report created containers as running."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.running: set[str] = set()
+
+    def run(self, cmd, **kwargs):
+        assert cmd[0] == "docker" and cmd[1] != "docker"
+        self.calls.append(cmd)
+        if cmd[1] == "run":
+            self.running.add(cmd[cmd.index("--name") + 1])
+        if cmd[1] == "ps":
+            return _Completed("\n".join(sorted(self.running)))
+        return _Completed()
+
+    def count(self, subcommand: str) -> int:
+        return sum(1 for cmd in self.calls if cmd[1] == subcommand)
+
+
+def _acquire_kwargs(**overrides):
+    settings = DockerPoolSettings(pool_size=1, max_runs=25, ttl_seconds=600, acquire_timeout=1)
+    kwargs = {
+        "image": "img:tag",
+        "settings": settings,
+        "memory_limit_mb": 128,
+        "labels": {},
+        "docker_env": {},
+        "docker_context": None,
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+@pytest.fixture
+def fake_docker(monkeypatch: pytest.MonkeyPatch) -> _FakeDockerCLI:
+    fake = _FakeDockerCLI()
+    monkeypatch.setattr(docker_pool.subprocess, "run", fake.run)
+    return fake
+
+
+@pytest.fixture
+def pool(fake_docker):
+    pool = docker_pool.DockerPool()
+    yield pool
+    pool.close()
+
+
+def _start_waiter(pool: docker_pool.DockerPool, acquired: list[str]) -> threading.Thread:
+    def _waiter() -> None:
+        lease = pool.acquire(**_acquire_kwargs(settings=DockerPoolSettings(1, 25, 600, 5)))
+        acquired.append(lease.container_name)
+
+    thread = threading.Thread(target=_waiter)
+    thread.start()
+    time.sleep(0.1)
+    return thread
+
+
+def test_pool_reuses_idle_container_without_per_acquire_inspect(pool, fake_docker) -> None:
+
+    lease = pool.acquire(**_acquire_kwargs())
+    pool.release(image="img:tag", container_name=lease.container_name)
+    for _ in range(3):
+        again = pool.acquire(**_acquire_kwargs())
+        assert again.container_name == lease.container_name
+        pool.release(image="img:tag", container_name=again.container_name)
+
+    assert fake_docker.count("ps") == 0
+    assert fake_docker.count("inspect") == 0
+
+
+def test_pool_waiter_wakes_on_release(pool) -> None:
+    held = pool.acquire(**_acquire_kwargs())
+    acquired: list[str] = []
+    thread = _start_waiter(pool, acquired)
+    assert acquired == []
+
+    started = time.monotonic()
+    pool.release(image="img:tag", container_name=held.container_name)
+    thread.join(timeout=2)
+    assert acquired == [held.container_name]
+    assert time.monotonic() - started < 1
+
+
+def test_pool_acquire_times_out_when_exhausted(pool) -> None:
+    pool.acquire(**_acquire_kwargs())
+    with pytest.raises(TimeoutError, match="Timed out acquiring"):
+        pool.acquire(**_acquire_kwargs())
+
+
+def test_pool_uses_separate_lock_per_image() -> None:
+    pool = docker_pool.DockerPool()
+    lock_a, entries_a, waiters_a = pool._image_state("a:1")
+    lock_b, _, _ = pool._image_state("b:1")
+    assert lock_a is not lock_b
+    with lock_a:
+        assert lock_b.acquire(blocking=False)
+        lock_b.release()
+    assert pool._image_state("a:1") == (lock_a, entries_a, waiters_a)
+
+
+def test_pool_hands_released_containers_to_waiters_in_fifo_order(pool) -> None:
+    held = pool.acquire(**_acquire_kwargs())
+    first: list[str] = []
+    second: list[str] = []
+    first_thread = _start_waiter(pool, first)
+    second_thread = _start_waiter(pool, second)
+
+    pool.release(image="img:tag", container_name=held.container_name)
+    first_thread.join(timeout=2)
+    assert first == [held.container_name]
+    assert second == []
+
+    pool.release(image="img:tag", container_name=held.container_name)
+    second_thread.join(timeout=2)
+    assert second == [held.container_name]
+
+
+def test_pool_bad_release_lets_waiter_create_replacement(pool, fake_docker) -> None:
+    held = pool.acquire(**_acquire_kwargs())
+    acquired: list[str] = []
+    thread = _start_waiter(pool, acquired)
+
+    pool.release(image="img:tag", container_name=held.container_name, mark_bad=True)
+    thread.join(timeout=2)
+    assert len(acquired) == 1
+    assert acquired[0] != held.container_name
+    assert fake_docker.count("run") == 2
+
+
+def test_pool_ensure_warm_fills_pool_in_background(pool, fake_docker) -> None:
+    settings = DockerPoolSettings(pool_size=3, max_runs=25, ttl_seconds=600, acquire_timeout=1)
+    kwargs = _acquire_kwargs(settings=settings)
+    held = pool.acquire(**kwargs)
+
+    pool.ensure_warm(**kwargs)
+    pool.ensure_warm(**kwargs)
+    pool._warmer.shutdown(wait=True)
+
+    assert fake_docker.count("run") == 3
+    _, entries, _ = pool._image_state("img:tag")
+    assert [entry.in_use for entry in entries] == [True, False, False]
+    assert entries[0].lease is held
+
+    pool.close()
+    pool.ensure_warm(**kwargs)
+    assert fake_docker.count("run") == 3
+    assert fake_docker.count("rm") == 2
+    assert [entry.lease for entry in entries] == [held]
+
+
+def test_global_pool_removes_idle_containers_at_exit() -> None:
+    probe = textwrap.dedent(
+        """
+        from safe_py_runner.execution import docker_pool
+
+        def _run(cmd, **kwargs):
+            print(cmd[1], flush=True)
+            return type("Completed", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+
+        docker_pool.subprocess.run = _run
+        pool = docker_pool.GLOBAL_DOCKER_POOL
+        lease = pool.acquire(
+            image="img:tag",
+            settings=docker_pool.DockerPoolSettings(1, 25, 600, 1),
+            memory_limit_mb=128,
+            labels={},
+            docker_env={},
+            docker_context=None,
+        )
+        pool.release(image="img:tag", container_name=lease.container_name)
+        """
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.split() == ["run", "rm"]
+
+
+def test_pool_warm_failure_wakes_waiter_on_any_exception(
+    pool, fake_docker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    create = pool._create_container
+    unblock = threading.Event()
+
+    def _failing_create(**kwargs):
+        unblock.wait(timeout=2)
+        monkeypatch.setattr(pool, "_create_container", create)
+        raise OSError("docker binary vanished")
+
+    monkeypatch.setattr(pool, "_create_container", _failing_create)
+    settings = DockerPoolSettings(pool_size=1, max_runs=25, ttl_seconds=600, acquire_timeout=5)
+    kwargs = _acquire_kwargs(settings=settings)
+    pool.ensure_warm(**kwargs)
+    acquired: list[str] = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire(**kwargs).container_name))
+    thread.start()
+    _, _, waiters = pool._image_state("img:tag")
+    while not waiters:
+        time.sleep(0.01)
+    unblock.set()
+
+    thread.join(timeout=2)
+    assert len(acquired) == 1
+    assert pool._warming["img:tag"] == 0
+    assert fake_docker.count("run") == 1
+
+
+def test_pool_rotates_without_docker_calls_under_lock(
+    pool, fake_docker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    kwargs = _acquire_kwargs(settings=DockerPoolSettings(1, 1, 600, 1))
+    pool._image_state("img:tag")
+    lock = pool._locks["img:tag"] = _OwnedLock()
+    first = pool.acquire(**kwargs)
+    pool.release(image="img:tag", container_name=first.container_name)
+    monkeypatch.setattr(docker_pool.subprocess, "run", _locked_guard(fake_docker.run, lock))
+
+    second = pool.acquire(**kwargs)
+    assert second.container_name != first.container_name
+    pool.release(image="img:tag", container_name=second.container_name, mark_bad=True)
+    pool.close()
+
+    assert fake_docker.count("rm") == 2
+
+
+def test_pool_sweep_drops_stopped_and_expired_idle_containers(pool, fake_docker) -> None:
+    settings = DockerPoolSettings(pool_size=2, max_runs=25, ttl_seconds=600, acquire_timeout=1)
+    kwargs = _acquire_kwargs(settings=settings)
+    stopped = pool.acquire(**kwargs)
+    expired = pool.acquire(**kwargs)
+    for lease in (stopped, expired):
+        lease.created_at -= 1
+        pool.release(image="img:tag", container_name=lease.container_name)
+    fake_docker.running.discard(stopped.container_name)
+    expired.created_at -= 600
+
+    pool._sweep()
+
+    _, entries, _ = pool._image_state("img:tag")
+    assert entries == []
+    removed = {cmd[-1] for cmd in fake_docker.calls if cmd[1] == "rm"}
+    assert removed == {stopped.container_name, expired.container_name}
+
+
+def test_pool_janitor_stops_once_pool_is_empty(pool, fake_docker) -> None:
+    kwargs = _acquire_kwargs(settings=DockerPoolSettings(1, 25, 600, 1))
+    lease = pool.acquire(**kwargs)
+    janitor = pool._janitor
+    assert janitor is not None and janitor.is_alive()
+
+    pool.release(image="img:tag", container_name=lease.container_name, mark_bad=True)
+    janitor.join(timeout=2)
+
+    assert not janitor.is_alive() and pool._janitor is None
+    calls = len(fake_docker.calls)
+    pool._sweep()
+    assert len(fake_docker.calls) == calls, "an empty pool must not call docker ps"
+    pool.acquire(**kwargs)
+    assert pool._janitor is not None and pool._janitor.is_alive()
+
+
+class _OwnedLock:
+    """Image lock stand-in that records which thread holds it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.owner: int | None = None
+
+    def __enter__(self) -> Self:
+        self._lock.acquire()
+        self.owner = threading.get_ident()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.owner = None
+        self._lock.release()
+
+
+def _locked_guard(run, lock: _OwnedLock):
+    def _run(cmd, **kwargs):
+        if cmd[1] == "rm":
+            assert lock.owner != threading.get_ident(), "docker rm ran under the image lock"
+        return run(cmd, **kwargs)
+
+    return _run
@@ -1,20 +1,55 @@
+import stat
+from typing import Any
+
 import pytest
 
 from safe_py_runner import DockerEngine
 
 
-def test_docker_context_conflicts_with_docker_host() -> None:
-    with pytest.raises(ValueError, match="either docker_context"):
-        DockerEngine(docker_context="remote", docker_host="ssh://user@host")
-
-
-def test_ssh_user_requires_ssh_host() -> None:
-    with pytest.raises(ValueError, match="ssh_user requires ssh_host"):
-        DockerEngine(ssh_user="alice")
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        pytest.param(
+            {"docker_context": "remote", "docker_host": "ssh://user@host"},
+            "either docker_context",
+            id="context-and-host",
+        ),
+        pytest.param({"ssh_user": "alice"}, "ssh_user requires ssh_host", id="ssh-user-without-host"),
+        pytest.param({"packages": ["pandas"]}, "pinned", id="unpinned-packages"),
+    ],
+)
+def test_docker_engine_rejects_invalid_config(kwargs: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        DockerEngine(**kwargs)
 
 
 def test_ssh_env_is_constructed() -> None:
     engine = DockerEngine(ssh_host="example.com", ssh_user="alice", ssh_port=2222)
-    env = engine._docker_env()  # noqa: SLF001 - validating internal connection config
+    env = engine._docker_env()
     assert env["DOCKER_HOST"] == "ssh://alice@example.com"
     assert "-p 2222" in env["DOCKER_SSH_COMMAND"]
+
+
+def test_ssh_env_reuses_persistent_connection() -> None:
+    engine = DockerEngine(ssh_host="example.com")
+    env = engine._docker_env()
+    assert "ControlMaster=auto" in env["DOCKER_SSH_COMMAND"]
+    assert "ControlPersist=" in env["DOCKER_SSH_COMMAND"]
+
+
+def test_ssh_control_path_is_in_private_user_dir(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    control_dir = tmp_path / ".ssh" / "safe-py-runner"
+    control_dir.mkdir(parents=True, mode=0o755)
+
+    env = DockerEngine(ssh_host="example.com")._docker_env()
+
+    assert f"ControlPath={control_dir / '%C'}" in env["DOCKER_SSH_COMMAND"]
+    assert stat.S_IMODE(control_dir.stat().st_mode) == 0o700
+
+
+def test_local_target_inherits_parent_env_without_copy() -> None:
+    engine = DockerEngine()
+    assert engine._docker_env() is None
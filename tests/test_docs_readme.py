@@ -1,42 +1,30 @@
-from pathlib import Path
+def test_readme_links_bubblewrap_comparison_doc(readme_text: str, bubblewrap_comparison_text: str) -> None:
+    assert "## Bubblewrap Comparison" in readme_text
+    assert "[docs/BUBBLEWRAP_COMPARISON.md](docs/BUBBLEWRAP_COMPARISON.md)" in readme_text
+    assert "| Capability | `safe-py-runner` | `bubblewrap` (`bwrap`) |" in bubblewrap_comparison_text
 
 
-def test_readme_links_bubblewrap_comparison_doc() -> None:
-    root = Path(__file__).resolve().parents[1]
-    readme = (root / "README.md").read_text(encoding="utf-8")
-    comparison_doc = root / "docs" / "BUBBLEWRAP_COMPARISON.md"
-    comparison_text = comparison_doc.read_text(encoding="utf-8")
+def test_readme_has_explicit_honest_scope_statement(readme_text: str) -> None:
+    assert "Honest scope:" in readme_text
+    assert "Good fit:" in readme_text
+    assert "Not good alone:" in readme_text
 
-    assert "## Bubblewrap Comparison" in readme
-    assert "[docs/BUBBLEWRAP_COMPARISON.md](docs/BUBBLEWRAP_COMPARISON.md)" in readme
-    assert comparison_doc.exists()
-    assert "| Capability | `safe-py-runner` | `bubblewrap` (`bwrap`) |" in comparison_text
 
+def test_readme_common_gotchas_are_current(readme_text: str) -> None:
+    assert "### Common Gotchas" in readme_text
+    assert "`importlib` is blocked intentionally in all modes." in readme_text
+    assert "`engine` is required." in readme_text
+    assert "only accepts pinned specs." in readme_text
+    assert "DockerEngine does not silently fall back to local execution." in readme_text
 
-def test_readme_has_explicit_honest_scope_statement() -> None:
-    root = Path(__file__).resolve().parents[1]
-    readme = (root / "README.md").read_text(encoding="utf-8")
 
-    assert "Honest scope:" in readme
-    assert "Good fit:" in readme
-    assert "Not good alone:" in readme
+def test_pypi_readme_includes_gotchas_section(pypi_readme_text: str) -> None:
+    assert "## Common Gotchas" in pypi_readme_text
+    assert "`engine` is required for `run_code(...)`" in pypi_readme_text
+    assert "`importlib` is intentionally blocked in all modes." in pypi_readme_text
 
 
-def test_readme_common_gotchas_are_current() -> None:
-    root = Path(__file__).resolve().parents[1]
-    readme = (root / "README.md").read_text(encoding="utf-8")
-
-    assert "### Common Gotchas" in readme
-    assert "`importlib` is blocked intentionally in all modes." in readme
-    assert "`engine` is required." in readme
-    assert "only accepts pinned specs." in readme
-    assert "DockerEngine does not silently fall back to local execution." in readme
-
-
-def test_pypi_readme_includes_gotchas_section() -> None:
-    root = Path(__file__).resolve().parents[1]
-    pypi_readme = (root / "docs" / "README_PYPI.md").read_text(encoding="utf-8")
-
-    assert "## Common Gotchas" in pypi_readme
-    assert "`engine` is required for `run_code(...)`" in pypi_readme
-    assert "`importlib` is intentionally blocked in all modes." in pypi_readme
+def test_readme_push_docs_match_master_branch(readme_text: str) -> None:
+    assert "Push to `master`" in readme_text
+    assert "Push to `main`" not in readme_text
+    assert "passed on `master`" in readme_text
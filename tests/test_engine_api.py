@@ -1,18 +1,230 @@
+import json
+from typing import Any
+
 import pytest
 
-from safe_py_runner import DockerEngine, LocalEngine
+from safe_py_runner import LocalEngine, RunnerPolicy, run_code
+from safe_py_runner.execution import local_engine
+from safe_py_runner.execution.types import ExecutionRequest
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        pytest.param({"venv_dir": ""}, "venv_dir", id="empty-venv-dir"),
+        pytest.param(
+            {"venv_dir": "/tmp/safe_py_runner_unpinned_local", "packages": ["pandas"]},
+            "pinned",
+            id="unpinned-packages",
+        ),
+    ],
+)
+def test_local_engine_rejects_invalid_config(kwargs: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        LocalEngine(**kwargs)
+
+
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_reuses_worker_with_fresh_state_per_run(test_venv_dir: str) -> None:
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    try:
+        first = run_code("import math\nmath.answer = 42\nresult = 1", engine=engine)
+        worker = engine._worker
+        second = run_code("import math\nresult = hasattr(math, 'answer')", engine=engine)
+
+        assert first.ok and second.ok
+        assert second.result is False
+        assert engine._worker is worker
+    finally:
+        engine.close()
+
+
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_worker_survives_timeouts(test_venv_dir: str) -> None:
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    try:
+        timed_out = run_code(
+            "while True:\n    pass", engine=engine, policy=RunnerPolicy(timeout_seconds=1)
+        )
+        after = run_code("result = 2", engine=engine)
+
+        assert timed_out.timed_out and timed_out.exit_code == 124
+        assert after.ok and after.result == 2
+    finally:
+        engine.close()
+
+
+def test_local_engine_marker_tracks_installed_package_set(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "python").touch()
+    installs: list[list[str]] = []
+
+    class _Completed:
+        returncode = 0
+        stderr = ""
+
+    def _fake_run(cmd, **kwargs):
+        installs.append(cmd[4:])
+        return _Completed()
+
+    monkeypatch.setattr(local_engine.subprocess, "run", _fake_run)
+    for packages in (["a==1"], ["a==1"], ["b==2"], ["a==1"]):
+        monkeypatch.setattr(local_engine, "_ENV_READY_CACHE", set())
+        LocalEngine(venv_dir=str(tmp_path), packages=packages).close()
+
+    assert installs == [["a==1"], ["b==2"], ["a==1"]]
+    assert len(list(tmp_path.glob(".safe_py_runner_packages.*"))) == 1
+
+
+def test_local_engine_skips_environment_checks_until_venv_disappears(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "python").touch()
+    monkeypatch.setattr(local_engine, "_ENV_READY_CACHE", set())
+    LocalEngine(venv_dir=str(tmp_path)).close()
+    mkdir = local_engine.Path.mkdir
+
+    def _no_mkdir(*args, **kwargs):
+        raise AssertionError("environment was re-checked")
+
+    monkeypatch.setattr(local_engine.Path, "mkdir", _no_mkdir)
+    LocalEngine(venv_dir=str(tmp_path)).close()
+    monkeypatch.setattr(local_engine.Path, "mkdir", mkdir)
+
+    (tmp_path / "bin" / "python").unlink()
+    created: list[list[str]] = []
+
+    class _Completed:
+        returncode = 0
+        stderr = ""
+
+    def _fake_run(cmd, **kwargs):
+        created.append(cmd)
+        return _Completed()
+
+    monkeypatch.setattr(local_engine.subprocess, "run", _fake_run)
+    LocalEngine(venv_dir=str(tmp_path)).close()
+    assert created == [["uv", "venv", str(tmp_path)]]
+
+
+def test_local_engine_execute_batch_keeps_order_and_per_request_timeouts(test_venv_dir: str) -> None:
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    requests = [
+        ExecutionRequest(payload={"code": "result = 1"}, timeout_seconds=5),
+        ExecutionRequest(payload={"code": "while True:\n    pass"}, timeout_seconds=1),
+        ExecutionRequest(payload={"code": "print('hi')\nresult = 3"}, timeout_seconds=5),
+    ]
+    try:
+        outcomes = engine.execute_batch(requests)
+    finally:
+        engine.close()
+
+    assert [outcome.timed_out for outcome in outcomes] == [False, True, False]
+    assert json.loads(outcomes[0].stdout)["result"] == 1
+    assert json.loads(outcomes[2].stdout)["stdout"] == "hi\n"
+    assert engine.execute_batch([]) == []
+
+
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_sends_unchanged_policy_once(test_venv_dir: str) -> None:
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    policy = {"mode": "restrict", "blocked_imports": ["math"]}
+    request = ExecutionRequest(payload={"code": "import math", "policy": policy}, timeout_seconds=5)
+    try:
+        first = engine._worker_frame(request)
+        second = engine._worker_frame(request)
+        assert "policy" in first["payload"] and "reuse_policy" not in first
+        assert second["reuse_policy"] is True and "policy" not in second["payload"]
+        # The frames above were never sent, so the worker has no policy yet.
+        engine._sent_policy = None
+
+        outcomes = [engine.execute(request) for _ in range(2)]
+        policy["blocked_imports"] = []
+        outcomes.append(engine.execute(request))
+    finally:
+        engine.close()
+
+    assert [json.loads(outcome.stdout)["ok"] for outcome in outcomes] == [False, False, True]
+
+
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_resends_policy_after_unencodable_request(test_venv_dir: str) -> None:
+    import datetime
+
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    strict = RunnerPolicy(blocked_imports=["os"])
+    try:
+        assert run_code("result = 1", engine=engine, policy=RunnerPolicy(blocked_imports=[])).ok
+        with pytest.raises(TypeError):
+            run_code(
+                "result = 1",
+                engine=engine,
+                policy=strict,
+                input_data={"when": datetime.date(2024, 1, 2)},
+            )
+        after = run_code("import os\nresult = 'os imported'", engine=engine, policy=strict)
+    finally:
+        engine.close()
+
+    assert not after.ok
+
 
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_stops_worker_on_exit_or_collection(test_venv_dir: str) -> None:
+    import gc
 
-def test_local_engine_requires_venv_dir() -> None:
-    with pytest.raises(ValueError, match="venv_dir"):
-        LocalEngine(venv_dir="")
+    with LocalEngine(venv_dir=test_venv_dir, venv_manager="uv") as engine:
+        assert run_code("result = 1", engine=engine).ok
+        worker = engine._worker
+    assert worker is not None and worker.poll() is not None
 
+    engine = LocalEngine(venv_dir=test_venv_dir, venv_manager="uv")
+    assert run_code("result = 1", engine=engine).ok
+    worker = engine._worker
+    del engine
+    gc.collect()
+    assert worker is not None and worker.poll() is not None
 
-def test_local_engine_rejects_unpinned_packages() -> None:
-    with pytest.raises(ValueError, match="pinned"):
-        LocalEngine(venv_dir="/tmp/safe_py_runner_unpinned_local", packages=["pandas"])
 
+@pytest.mark.skipif(
+    not local_engine.PERSISTENT_WORKER_SUPPORTED, reason="persistent worker needs os.fork"
+)
+def test_local_engine_batch_items_cannot_see_sibling_data(test_venv_dir: str) -> None:
+    probe = (
+        "import gc, sys\n"
+        "def leaks():\n"
+        "    needle = ''.join(['sk-', 'sibling'])\n"
+        "    found = [o for o in gc.get_objects() if isinstance(o, (dict, list)) and needle in repr(o)]\n"
+        "    frame = sys._getframe(1)\n"
+        "    while frame is not None:\n"
+        "        if needle in repr(frame.f_locals):\n"
+        "            found.append(frame.f_code.co_name)\n"
+        "        frame = frame.f_back\n"
+        "    return found\n"
+        "result = leaks()\n"
+    )
+    secret = {"code": "result = input_data['token']", "input_data": {"token": "sk-sibling"}}
+    requests = [
+        ExecutionRequest(payload={"code": probe}, timeout_seconds=5),
+        ExecutionRequest(payload=secret, timeout_seconds=5),
+        ExecutionRequest(payload={"code": probe}, timeout_seconds=5),
+    ]
+    with LocalEngine(venv_dir=test_venv_dir, venv_manager="uv") as engine:
+        results = [json.loads(outcome.stdout) for outcome in engine.execute_batch(requests)]
 
-def test_docker_engine_rejects_unpinned_packages() -> None:
-    with pytest.raises(ValueError, match="pinned"):
-        DockerEngine(packages=["pandas"])
+    assert [result["ok"] for result in results] == [True, True, True]
+    assert results[1]["result"] == "sk-sibling"
+    assert results[0]["result"] == [] and results[2]["result"] == []
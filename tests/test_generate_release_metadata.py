@@ -0,0 +1,46 @@
+import pytest
+
+
+def test_parse_markdown_splits_title_and_description(generate_metadata_module):
+    source = "\n\n# safe-py-runner {{tag}}\n\n\n- Added pooling.\n\n- Fixed CLI.\n\n"
+
+    title, description = generate_metadata_module.parse_markdown(source)
+
+    assert title == "safe-py-runner {{tag}}"
+    assert description == "- Added pooling.\n\n- Fixed CLI."
+
+
+def test_parse_markdown_rejects_missing_description(generate_metadata_module):
+
+    with pytest.raises(ValueError, match="Release description is empty"):
+        generate_metadata_module.parse_markdown("# Only a title\n\n")
+    with pytest.raises(ValueError, match="Input markdown is empty"):
+        generate_metadata_module.parse_markdown(" \n\t\n")
+
+
+def test_main_writes_ascii_escaped_json(generate_metadata_module, tmp_path, monkeypatch):
+    source = tmp_path / "notes.md"
+    source.write_text("# Release {{tag}}\n\nCafé ☕ fixes.\n", encoding="utf-8")
+    output = tmp_path / "metadata.json"
+    monkeypatch.setattr(
+        "sys.argv", ["generate", "--input", str(source), "--output", str(output)]
+    )
+
+    assert generate_metadata_module.main() == 0
+    assert output.read_bytes() == (
+        b'{\n  "title": "Release {{tag}}",\n'
+        b'  "description": "Caf\\u00e9 \\u2615 fixes."\n}\n'
+    )
+
+
+def test_main_normalizes_crlf_release_notes(generate_metadata_module, tmp_path, monkeypatch):
+    source = tmp_path / "notes.md"
+    source.write_bytes(b"# Release {{tag}}\r\n\r\n- Added pooling.\r\n- Fixed CLI.\r\n")
+    output = tmp_path / "metadata.json"
+    monkeypatch.setattr(
+        "sys.argv", ["generate", "--input", str(source), "--output", str(output)]
+    )
+
+    assert generate_metadata_module.main() == 0
+    assert b"\\r" not in output.read_bytes()
+    assert b'"description": "- Added pooling.\\n- Fixed CLI."' in output.read_bytes()
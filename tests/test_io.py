@@ -1,67 +1,49 @@
-from safe_py_runner import LocalEngine, run_code as raw_run_code
+import math
 
-ENGINE = LocalEngine(venv_dir="/tmp/safe_py_runner_test_venv", venv_manager="uv")
+import pytest
 
-def run_code(*args, **kwargs):
-    kwargs.setdefault("engine", ENGINE)
-    return raw_run_code(*args, **kwargs)
-
-
-def test_simple_io() -> None:
-    """Verify simple input and output works."""
-    code = "result = x + y"
-    input_data = {"x": 10, "y": 20}
-    result = run_code(code, input_data=input_data)
-
-    assert result.ok
-    assert result.result == 30
-
-
-def test_dict_io() -> None:
-    """Verify dictionary input and output."""
-    code = """
+_DICT_IO_CODE = """
 result = {
     "sum": data["a"] + data["b"],
     "diff": data["a"] - data["b"]
 }
 """
-    input_data = {"data": {"a": 15, "b": 5}}
-    result = run_code(code, input_data=input_data)
-
-    assert result.ok
-    assert result.result == {"sum": 20, "diff": 10}
 
 
-def test_stdout_capture() -> None:
-    """Verify print output is captured."""
-    code = """
-print("Hello")
-print("World")
-"""
-    result = run_code(code)
-    assert result.ok
-    assert "Hello\nWorld" in result.stdout
-
-
-def test_syntax_error() -> None:
-    """Verify syntax errors in user code are captured correctly."""
-    code = "def incomplete_function("
-    result = run_code(code)
-
-    assert not result.ok
-    assert "SyntaxError" in (result.error or "")
-
-
-def test_runtime_error() -> None:
-    """Verify runtime exceptions are captured."""
-    code = "x = 1 / 0"
-    result = run_code(code)
+@pytest.mark.parametrize(
+    ("code", "input_data", "ok", "field", "expected"),
+    [
+        # Simple input and output.
+        pytest.param("result = x + y", {"x": 10, "y": 20}, True, "result", 30, id="simple_io"),
+        # Dictionary input and output.
+        pytest.param(
+            _DICT_IO_CODE,
+            {"data": {"a": 15, "b": 5}},
+            True,
+            "result",
+            {"sum": 20, "diff": 10},
+            id="dict_io",
+        ),
+        # Print output is captured.
+        pytest.param('print("Hello")\nprint("World")\n', None, True, "stdout", "Hello\nWorld", id="stdout_capture"),
+        # Syntax errors in user code are captured.
+        pytest.param("def incomplete_function(", None, False, "error", "SyntaxError", id="syntax_error"),
+        # Runtime exceptions are captured.
+        pytest.param("x = 1 / 0", None, False, "error", "ZeroDivisionError", id="runtime_error"),
+    ],
+)
+def test_run_code_io(run_code, code: str, input_data: dict | None, ok: bool, field: str, expected: object) -> None:
+    """Verify inputs reach user code and results, output, and errors come back."""
+    result = run_code(code, input_data=input_data)
 
-    assert not result.ok
-    assert "ZeroDivisionError" in (result.error or "")
+    assert result.ok is ok
+    if field == "result":
+        assert result.result == expected
+    else:
+        assert expected in (getattr(result, field) or "")
 
 
-def test_json_types_roundtrip() -> None:
+def test_json_types_roundtrip(run_code) -> None:
     """Verify various JSON types (bool, null, float, list)."""
     code = """
 result = {
@@ -80,7 +62,7 @@ result = {
     assert res["list_val"] == [1, 2, 3]
 
 
-def test_reserved_keys_protection() -> None:
+def test_reserved_keys_protection(run_code) -> None:
     """
     Verify that reserved input keys don't overwrite internal variables.
     reserved = {"__builtins__", "input_data", "result", "_print_", ...}
@@ -98,3 +80,14 @@ def test_reserved_keys_protection() -> None:
     code = "result = 'valid'"
     result = run_code(code, input_data=input_data)
     assert result.result == "valid"
+
+
+def test_non_finite_floats_and_big_ints_roundtrip(run_code) -> None:
+    """Verify NaN, infinities, and ints wider than 64 bits come back exactly."""
+    result = run_code('result = [float("nan"), float("inf"), float("-inf"), 2**70]')
+
+    assert result.ok
+    nan, inf, neg_inf, big = result.result
+    assert math.isnan(nan)
+    assert inf == float("inf") and neg_inf == float("-inf")
+    assert type(big) is int and big == 2**70
@@ -1,33 +1,28 @@
-from pathlib import Path
+import re
 
+_MAKE_TEST_BLOCK = re.compile(r"^test:\n.*?(?=\n\nlint:\n)", re.DOTALL | re.MULTILINE)
+_CHECK_VERSION_BLOCK = re.compile(
+    r"^check-version:\n.*?(?=\n\ncheck-version-different-from-pyproject:)", re.DOTALL | re.MULTILINE
+)
 
-def _project_root() -> Path:
-    return Path(__file__).resolve().parents[1]
 
+def _make_block(pattern: re.Pattern[str], makefile_text: str) -> str:
+    match = pattern.search(makefile_text)
+    assert match is not None, f"Makefile block not found: {pattern.pattern!r}"
+    return match.group(0)
 
-def test_make_test_target_runs_lint_type_and_pytest() -> None:
-    makefile = (_project_root() / "Makefile").read_text(encoding="utf-8")
-    start = makefile.index("test:\n")
-    end = makefile.index("\n\nlint:\n")
-    block = makefile[start:end]
+
+def test_make_test_target_runs_lint_type_and_pytest(makefile_text: str) -> None:
+    block = _make_block(_MAKE_TEST_BLOCK, makefile_text)
 
     assert "uv run --extra dev ruff check ." in block
     assert "uv run --extra dev mypy" in block
     assert "uv run --extra dev pytest" in block
+    # `make test` must include the `slow` tests the default pytest run skips.
+    assert 'uv run --extra dev pytest -m ""' in block
 
 
-def test_readme_push_docs_match_master_branch() -> None:
-    readme = (_project_root() / "README.md").read_text(encoding="utf-8")
-
-    assert "Push to `master`" in readme
-    assert "Push to `main`" not in readme
-    assert "passed on `master`" in readme
-
-
-def test_check_version_target_prints_version_number() -> None:
-    makefile = (_project_root() / "Makefile").read_text(encoding="utf-8")
-    start = makefile.index("check-version:\n")
-    end = makefile.index("\n\ncheck-version-different-from-pyproject:")
-    block = makefile[start:end]
+def test_check_version_target_prints_version_number(makefile_text: str) -> None:
+    block = _make_block(_CHECK_VERSION_BLOCK, makefile_text)
 
     assert 'echo "pyproject.toml version: $$pyproject_version (valid)"' in block
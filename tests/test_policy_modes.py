@@ -2,17 +2,12 @@ from pathlib import Path
 
 import pytest
 
-from safe_py_runner import RunnerPolicy, LocalEngine, run_code as raw_run_code
+from safe_py_runner import RunnerPolicy
 
-ENGINE = LocalEngine(venv_dir="/tmp/safe_py_runner_test_venv", venv_manager="uv")
 
-def run_code(*args, **kwargs):
-    kwargs.setdefault("engine", ENGINE)
-    return raw_run_code(*args, **kwargs)
-
-
-def test_policy_file_path_blocks_imports_and_builtins(tmp_path: Path) -> None:
-    policy_file = tmp_path / "policy.toml"
+@pytest.fixture(scope="module")
+def restrict_policy_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    policy_file = tmp_path_factory.mktemp("policy") / "policy.toml"
     policy_file.write_text(
         (
             "[policy]\n"
@@ -23,25 +18,48 @@ def test_policy_file_path_blocks_imports_and_builtins(tmp_path: Path) -> None:
         ),
         encoding="utf-8",
     )
+    return policy_file
 
-    import_result = run_code("import math", policy_file=str(policy_file))
-    assert import_result.ok is False
-    assert "blocked by policy" in (import_result.error or "")
 
-    builtin_result = run_code("result = len([1, 2, 3])", policy_file=str(policy_file))
-    assert builtin_result.ok is False
-    assert "name 'len' is not defined" in (builtin_result.error or "")
-
-    globals_result = run_code(
-        "result = x if 'x' in globals() else 'missing'",
-        input_data={"x": 7},
-        policy_file=str(policy_file),
-    )
-    assert globals_result.ok is True
-    assert globals_result.result == "missing"
+@pytest.fixture(scope="module")
+def restrict_policy(restrict_policy_file: Path) -> RunnerPolicy:
+    return RunnerPolicy.from_file(str(restrict_policy_file))
 
 
-def test_allow_mode_allows_only_selected_symbols() -> None:
+@pytest.mark.parametrize("source", ["policy_file", "policy"])
+@pytest.mark.parametrize(
+    ("code", "input_data", "ok", "expected"),
+    [
+        pytest.param("import math", None, False, "blocked by policy", id="import"),
+        pytest.param("result = len([1, 2, 3])", None, False, "name 'len' is not defined", id="builtin"),
+        pytest.param(
+            "result = x if 'x' in globals() else 'missing'", {"x": 7}, True, "missing", id="globals"
+        ),
+    ],
+)
+def test_policy_file_path_blocks_imports_and_builtins(
+    run_code,
+    restrict_policy_file: Path,
+    restrict_policy: RunnerPolicy,
+    source: str,
+    code: str,
+    input_data: dict[str, int] | None,
+    ok: bool,
+    expected: str,
+) -> None:
+    if source == "policy_file":
+        result = run_code(code, input_data=input_data, policy_file=str(restrict_policy_file))
+    else:
+        result = run_code(code, input_data=input_data, policy=restrict_policy)
+
+    assert result.ok is ok
+    if ok:
+        assert result.result == expected
+    else:
+        assert expected in (result.error or "")
+
+
+def test_allow_mode_allows_only_selected_symbols(run_code) -> None:
     policy = RunnerPolicy(
         mode="allow",
         allowed_imports=["math"],
@@ -67,9 +85,52 @@ def test_allow_mode_allows_only_selected_symbols() -> None:
     assert "name 'blocked_helper' is not defined" in (blocked_global.error or "")
 
 
-def test_run_code_rejects_policy_and_policy_file_together(tmp_path: Path) -> None:
+def test_run_code_rejects_policy_and_policy_file_together(run_code, tmp_path: Path) -> None:
     policy_file = tmp_path / "policy.toml"
     policy_file.write_text("[policy]\nmode = \"restrict\"\n", encoding="utf-8")
 
     with pytest.raises(ValueError, match="Provide either 'policy' or 'policy_file'"):
         run_code("result = 1", policy=RunnerPolicy(), policy_file=str(policy_file))
+
+
+def test_policy_file_is_reparsed_only_when_it_changes(tmp_path: Path, monkeypatch) -> None:
+    from safe_py_runner import policy as policy_module
+
+    policy_file = tmp_path / "policy.toml"
+    policy_file.write_text("[policy]\ntimeout_seconds = 3\n", encoding="utf-8")
+    parses: list[str] = []
+    real_loads = policy_module.tomllib.loads
+
+    def _counting_loads(text: str):
+        parses.append(text)
+        return real_loads(text)
+
+    monkeypatch.setattr(policy_module.tomllib, "loads", _counting_loads)
+    first = RunnerPolicy.from_file(str(policy_file))
+    first.extra_globals["leak"] = True
+    second = RunnerPolicy.from_file(str(policy_file))
+    policy_file.write_text("[policy]\ntimeout_seconds = 30\n", encoding="utf-8")
+    third = RunnerPolicy.from_file(str(policy_file))
+
+    assert (first.timeout_seconds, second.timeout_seconds, third.timeout_seconds) == (3, 3, 30)
+    assert second.extra_globals == {}
+    assert len(parses) == 2
+
+
+def test_policy_file_cache_tells_same_sized_files_apart(tmp_path: Path, monkeypatch) -> None:
+    import os
+
+    for name, timeout in (("a", 3), ("b", 4), ("swap", 5)):
+        (tmp_path / name).mkdir()
+        policy_file = tmp_path / name / "policy.toml"
+        policy_file.write_text(f"[policy]\ntimeout_seconds = {timeout}\n", encoding="utf-8")
+        os.utime(policy_file, ns=(1_700_000_000_000_000_000,) * 2)
+
+    timeouts = []
+    for name in ("a", "b"):
+        monkeypatch.chdir(tmp_path / name)
+        timeouts.append(RunnerPolicy.from_file("policy.toml").timeout_seconds)
+    os.replace(tmp_path / "swap" / "policy.toml", tmp_path / "b" / "policy.toml")
+    timeouts.append(RunnerPolicy.from_file("policy.toml").timeout_seconds)
+
+    assert timeouts == [3, 4, 5]
@@ -1,13 +1,7 @@
-from safe_py_runner import RunnerPolicy, LocalEngine, run_code as raw_run_code
+from safe_py_runner import RunnerPolicy
 
-ENGINE = LocalEngine(venv_dir="/tmp/safe_py_runner_test_venv", venv_manager="uv")
 
-def run_code(*args, **kwargs):
-    kwargs.setdefault("engine", ENGINE)
-    return raw_run_code(*args, **kwargs)
-
-
-def test_run_code_success_math_import() -> None:
+def test_run_code_success_math_import(run_code) -> None:
     policy = RunnerPolicy(
         timeout_seconds=2,
         memory_limit_mb=128,
@@ -25,7 +19,7 @@ def test_run_code_success_math_import() -> None:
     assert result.result == 9.0
 
 
-def test_import_blocked() -> None:
+def test_import_blocked(run_code) -> None:
     policy = RunnerPolicy(
         timeout_seconds=2,
         memory_limit_mb=128,
@@ -41,7 +35,7 @@ def test_import_blocked() -> None:
     assert "blocked by policy" in (result.error or "")
 
 
-def test_builtin_blocked() -> None:
+def test_builtin_blocked(run_code) -> None:
     policy = RunnerPolicy(
         timeout_seconds=2,
         memory_limit_mb=128,
@@ -55,3 +49,20 @@ def test_builtin_blocked() -> None:
     )
 
     assert result.ok is False
+
+
+def test_default_policy_lists_are_shared_tuples_sent_as_json_lists() -> None:
+    from safe_py_runner.execution.serialization import json_dumps_bytes, json_loads
+    from safe_py_runner.runner import _build_payload
+
+    first, second = RunnerPolicy(), RunnerPolicy()
+    assert isinstance(first.blocked_imports, tuple)
+    assert first.blocked_imports is second.blocked_imports
+
+    payload = json_loads(json_dumps_bytes(_build_payload("result = 1", None, first)))
+    assert payload["policy"]["blocked_imports"] == list(first.blocked_imports)
+
+    caller_list = ["os"]
+    built = _build_payload("result = 1", None, RunnerPolicy(blocked_imports=caller_list))
+    assert built["policy"]["blocked_imports"] == caller_list
+    assert built["policy"]["blocked_imports"] is not caller_list
@@ -1,37 +1,29 @@
-from safe_py_runner import RunnerPolicy, LocalEngine, run_code as raw_run_code
+import pytest
 
-ENGINE = LocalEngine(venv_dir="/tmp/safe_py_runner_test_venv", venv_manager="uv")
+from safe_py_runner import RunnerPolicy
 
-def run_code(*args, **kwargs):
-    kwargs.setdefault("engine", ENGINE)
-    return raw_run_code(*args, **kwargs)
 
-
-def test_blocked_import_direct() -> None:
-    """Verify that directly importing a blocked module fails."""
-    policy = RunnerPolicy(blocked_imports=["os"])
-    result = run_code("import os", policy=policy)
-    assert not result.ok
-    assert "blocked by policy" in (result.error or "")
+@pytest.fixture(scope="module")
+def block_os_policy() -> RunnerPolicy:
+    return RunnerPolicy(blocked_imports=["os"])
 
 
-def test_blocked_import_alias() -> None:
-    """Verify that aliasing a blocked module still fails."""
-    policy = RunnerPolicy(blocked_imports=["os"])
-    result = run_code("import os as my_os", policy=policy)
+@pytest.mark.parametrize(
+    "code",
+    [
+        pytest.param("import os", id="direct"),
+        pytest.param("import os as my_os", id="alias"),
+        pytest.param("from os import path", id="from"),
+    ],
+)
+def test_blocked_import_forms(run_code, block_os_policy: RunnerPolicy, code: str) -> None:
+    """Verify that direct, aliased, and 'from x import y' imports of a blocked module fail."""
+    result = run_code(code, policy=block_os_policy)
     assert not result.ok
     assert "blocked by policy" in (result.error or "")
 
 
-def test_blocked_import_from() -> None:
-    """Verify that 'from x import y' on a blocked module fails."""
-    policy = RunnerPolicy(blocked_imports=["os"])
-    result = run_code("from os import path", policy=policy)
-    assert not result.ok
-    assert "blocked by policy" in (result.error or "")
-
-
-def test_blocked_builtin_eval() -> None:
+def test_blocked_builtin_eval(run_code) -> None:
     """Verify that using eval is blocked."""
     policy = RunnerPolicy(blocked_builtins=["eval"])
     result = run_code("x = eval('1 + 1')", policy=policy)
@@ -43,7 +35,7 @@ def test_blocked_builtin_eval() -> None:
     )
 
 
-def test_blocked_builtin_exec() -> None:
+def test_blocked_builtin_exec(run_code) -> None:
     """Verify that using exec is blocked."""
     policy = RunnerPolicy(blocked_builtins=["exec"])
     result = run_code("exec('x = 1')", policy=policy)
@@ -51,7 +43,7 @@ def test_blocked_builtin_exec() -> None:
     assert "name 'exec' is not defined" in (result.error or "")
 
 
-def test_blocked_builtin_open() -> None:
+def test_blocked_builtin_open(run_code) -> None:
     """Verify that using open is blocked."""
     policy = RunnerPolicy(blocked_builtins=["open"])
     result = run_code("f = open('test.txt', 'w')", policy=policy)
@@ -59,7 +51,7 @@ def test_blocked_builtin_open() -> None:
     assert "name 'open' is not defined" in (result.error or "")
 
 
-def test_sys_exit_code() -> None:
+def test_sys_exit_code(run_code) -> None:
     """Verify that sys.exit() is handled gracefully."""
     # sys.exit(0) -> Success
     result = run_code("import sys\nsys.exit(0)")
@@ -73,7 +65,7 @@ def test_sys_exit_code() -> None:
     assert "SystemExit: 1" in (result_err.error or "")
 
 
-def test_sys_exit_string_message() -> None:
+def test_sys_exit_string_message(run_code) -> None:
     result = run_code("import sys\nsys.exit('stop now')")
     assert result.ok is False
     assert result.exit_code == 1
@@ -81,40 +73,119 @@ def test_sys_exit_string_message() -> None:
     assert "stop now" in result.stderr
 
 
-def test_importlib_bypass_attempt() -> None:
+def test_importlib_bypass_attempt(run_code, block_os_policy: RunnerPolicy) -> None:
     """
     Attempt to bypass import block using importlib.
     This should fail IF importlib itself is blocked or if the hook catches it.
     safe-py-runner's hook works on __import__, which importlib uses internally.
     """
-    policy = RunnerPolicy(blocked_imports=["os"])
     code = """
 import importlib
 os = importlib.import_module("os")
 """
-    result = run_code(code, policy=policy)
+    result = run_code(code, policy=block_os_policy)
     assert not result.ok
     assert "blocked by policy" in (result.error or "")
 
 
-def test_dunder_import_bypass_attempt() -> None:
+def test_dunder_import_bypass_attempt(run_code, block_os_policy: RunnerPolicy) -> None:
     """Attempt to bypass using __import__."""
-    policy = RunnerPolicy(blocked_imports=["os"])
     code = """
 os = __import__("os")
 """
-    result = run_code(code, policy=policy)
+    result = run_code(code, policy=block_os_policy)
     assert not result.ok
     assert "blocked by policy" in (result.error or "")
 
 
-def test_secure_defaults_block_os_import() -> None:
+def test_secure_defaults_block_os_import(run_code) -> None:
     result = run_code("import os")
     assert result.ok is False
     assert "blocked by policy" in (result.error or "")
 
 
-def test_secure_defaults_block_eval_builtin() -> None:
+def test_secure_defaults_block_eval_builtin(run_code) -> None:
     result = run_code("result = eval('1+1')")
     assert result.ok is False
     assert "name 'eval' is not defined" in (result.error or "")
+
+
+def test_safe_import_checks_root_package_against_policy() -> None:
+    from safe_py_runner import worker
+
+    allow_import = worker._safe_import_factory_mode("allow", {"json"}, set())
+    assert allow_import("json.decoder").__name__ == "json"
+    with pytest.raises(ImportError, match="not allowed"):
+        allow_import("jsonschema")
+
+    restrict_import = worker._safe_import_factory_mode("restrict", set(), {"os"})
+    for name in ("os.path", "importlib.util"):
+        with pytest.raises(ImportError, match="blocked"):
+            restrict_import(name)
+
+
+def test_syntax_errors_are_reported_through_the_persistent_worker(run_code) -> None:
+    for _ in range(2):
+        result = run_code("result = (")
+        assert result.ok is False
+        assert (result.error or "").startswith("SyntaxError:")
+
+
+def test_runs_cannot_read_earlier_runs_source_or_constants(run_code) -> None:
+    secret = "sk-tenant-A-secret"
+    assert run_code(f"token = {secret!r}\nresult = 1").ok
+    # Look through every tracked object, and dict values, for code objects
+    # (or functions) whose constants hold the earlier run's secret.
+    probe = run_code(
+        "import gc\n"
+        "needle = ''.join(['sk-tenant-', 'A-secret'])\n"
+        "def consts(value):\n"
+        "    code = getattr(value, '__code__', value)\n"
+        "    return repr(getattr(code, 'co_consts', ()))\n"
+        "result = any(\n"
+        "    needle in consts(value)\n"
+        "    for obj in gc.get_objects()\n"
+        "    for value in (obj, *(obj.values() if isinstance(obj, dict) else ()))\n"
+        ")"
+    )
+    assert probe.ok is True
+    assert probe.result is False
+
+
+def test_policy_builtins_are_built_once_per_policy() -> None:
+    from safe_py_runner import worker
+
+    args = ("restrict", frozenset(), frozenset({"os"}), frozenset(), frozenset({"eval"}))
+    builtins_map = worker._policy_builtins(*args)
+    assert worker._policy_builtins(*args) is builtins_map
+    assert "eval" not in builtins_map and "len" in builtins_map
+
+
+def test_builtins_mutation_does_not_leak_into_next_run(run_code) -> None:
+    tampered = run_code("__builtins__['len'] = lambda value: -1\nresult = len([1])")
+    clean = run_code("result = len([1])")
+    assert tampered.result == -1
+    assert clean.ok is True and clean.result == 1
+
+
+def test_input_keys_and_extra_globals_follow_policy_mode() -> None:
+    from safe_py_runner import worker
+
+    exec_globals = {"result": None}
+    data = {"x": 1, "y": 2, "_hidden": 3, "result": 4, "not valid": 5}
+    worker._inject_input_keys(exec_globals, data, "restrict", set(), {"y"})
+    assert exec_globals == {"result": None, "x": 1}
+
+    extra = {"a": 1, "b": 2}
+    assert worker._filter_extra_globals(extra, "allow", {"a"}, set()) == {"a": 1}
+    assert worker._filter_extra_globals(extra, "restrict", set(), {"a"}) == {"b": 2}
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [[1], {"blocked_imports": 5}, {"blocked_imports": [["os"]]}, {"mode": "bogus"}],
+)
+def test_warm_caches_skips_malformed_policies(policy) -> None:
+    from safe_py_runner import worker
+
+    worker._warm_caches({"code": "result = 1", "policy": policy})
@@ -0,0 +1,117 @@
+import datetime
+import json
+import math
+
+import pytest
+
+from safe_py_runner.execution import serialization
+
+
+def test_json_dumps_bytes_is_compact_and_round_trips() -> None:
+    payload = {"code": "result = 1", "input_data": {"x": [1, 2]}, "name": "café"}
+
+    data = serialization.json_dumps_bytes(payload)
+
+    assert b", " not in data and b": " not in data
+    assert json.loads(data) == payload
+    assert serialization.json_loads(data) == payload
+
+
+def test_json_dumps_bytes_matches_stdlib_encoding() -> None:
+    payload = {"input_data": {1: "one", "big": 2**70, "floats": [math.nan, math.inf, -math.inf]}}
+
+    data = serialization.json_dumps_bytes(payload)
+
+    assert data == json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize("use_msgspec", [True, False])
+def test_decode_worker_result_reads_typed_fields(
+    use_msgspec: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not use_msgspec:
+        monkeypatch.setattr(serialization, "_WORKER_RESULT_DECODER", None)
+    parsed = serialization.decode_worker_result(
+        b'{"ok": true, "result": {"x": [1, 2]}, "stdout": "hi\\n", "extra": 1}'
+    )
+
+    assert parsed == serialization.WorkerResult(ok=True, result={"x": [1, 2]}, stdout="hi\n")
+
+
+def test_decode_worker_result_coerces_loosely_typed_fields() -> None:
+    parsed = serialization.decode_worker_result('{"ok": 1, "stdout": 5, "error": "boom"}')
+
+    assert parsed.ok is True
+    assert parsed.stdout == "5"
+    assert parsed.error == "boom"
+
+
+def test_decode_worker_result_rejects_non_objects() -> None:
+    for raw in ("[]", "not json"):
+        with pytest.raises((TypeError, ValueError)):
+            serialization.decode_worker_result(raw)
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        {"result": {1: "one", "obj": range(2)}},
+        {"result": [(1, {2}), None, 1.5]},
+        {"result": [math.nan, math.inf, -math.inf]},
+        {"result": datetime.datetime(2024, 1, 2, 3, 4, 5)},
+        {"result": 2**70},
+    ],
+)
+def test_worker_dumps_matches_stdlib_default_str(response: dict) -> None:
+    from safe_py_runner import worker
+
+    data = worker._dumps(response)
+
+    expected = json.dumps(response, default=str, separators=(",", ":"))
+    assert data == expected.encode("utf-8")
+
+
+def test_worker_loads_keeps_non_finite_floats_and_big_ints() -> None:
+    from safe_py_runner import worker
+
+    nan, inf, big = worker._loads(b'[NaN, Infinity, 1180591620717411303424]')
+
+    assert math.isnan(nan) and inf == math.inf
+    assert type(big) is int and big == 2**70
+
+
+def test_decode_worker_result_stdlib_path_keeps_canonical_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(serialization, "_WORKER_RESULT_DECODER", None)
+
+    parsed = serialization.decode_worker_result('{"ok": false, "stdout": null, "timed_out": 0}')
+
+    assert parsed == serialization.WorkerResult(ok=False, stdout="None", timed_out=False)
+    assert parsed.timed_out is False
+
+
+@pytest.mark.parametrize("use_msgspec", [True, False])
+@pytest.mark.parametrize(
+    ("raw", "check"),
+    [
+        pytest.param(b'{"ok": true, "result": NaN}', math.isnan, id="nan"),
+        pytest.param(b'{"ok": true, "result": Infinity}', lambda value: value == math.inf, id="inf"),
+        pytest.param(b'{"ok": true, "result": -Infinity}', lambda value: value == -math.inf, id="-inf"),
+        pytest.param(
+            b'{"ok": true, "result": 1180591620717411303424}',
+            lambda value: type(value) is int and value == 2**70,
+            id="int-over-64-bits",
+        ),
+    ],
+)
+def test_decode_worker_result_keeps_stdlib_only_values(
+    raw: bytes, check, use_msgspec: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not use_msgspec:
+        monkeypatch.setattr(serialization, "_WORKER_RESULT_DECODER", None)
+
+    parsed = serialization.decode_worker_result(raw)
+
+    assert parsed.ok is True
+    assert check(parsed.result)